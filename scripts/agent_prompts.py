@@ -8,8 +8,9 @@ Builds structured system prompts for each agent with:
 - Safety guidelines
 """
 
+import asyncio
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from functools import lru_cache
 from pathlib import Path
@@ -17,12 +18,16 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Agent definition files, resolved from the repo rather than the working
+# directory
+AGENT_PROMPT_DIR = Path(__file__).resolve().parent.parent / ".claude" / "agents"
+
 # ==================== Data Classes ====================
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NetworkContext:
-    """Current network context for prompt injection."""
+    """Current network context for prompt injection (immutable once cached)."""
 
     org_name: str
     org_id: str
@@ -30,12 +35,25 @@ class NetworkContext:
     device_count: int
     profile_name: str
     timestamp: datetime
+    # True when device_count covers only the first MAX_NETWORKS_TO_COUNT networks
+    device_count_approx: bool = False
+    # Prompt-safe copies, sanitized once at construction
+    safe_org_name: str = field(init=False, repr=False, compare=False)
+    safe_profile_name: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # frozen=True: bypass __setattr__ for the derived fields
+        object.__setattr__(self, "safe_org_name", _sanitize_context_value(self.org_name))
+        object.__setattr__(
+            self, "safe_profile_name", _sanitize_context_value(self.profile_name)
+        )
 
 
 # ==================== Cache Management ====================
 
 _CONTEXT_CACHE: dict[str, tuple[NetworkContext, datetime]] = {}
 CACHE_TTL_SECONDS = 300  # 5 minutes
+MAX_NETWORKS_TO_COUNT = 500  # Device counting cap for very large orgs
 
 
 def _is_cache_valid(profile: str) -> bool:
@@ -74,6 +92,113 @@ def invalidate_context_cache(profile: Optional[str] = None) -> None:
 # ==================== Network Context ====================
 
 
+def _networks_to_count(networks: list) -> tuple[list, bool]:
+    """
+    Apply the MAX_NETWORKS_TO_COUNT cap to the networks used for device counting.
+
+    Args:
+        networks: Networks returned by discover_networks
+
+    Returns:
+        Tuple of (networks to count, whether the list was truncated)
+    """
+    if len(networks) <= MAX_NETWORKS_TO_COUNT:
+        return networks, False
+
+    logger.info(
+        f"Counting devices in first {MAX_NETWORKS_TO_COUNT} of {len(networks)} networks"
+    )
+    return networks[:MAX_NETWORKS_TO_COUNT], True
+
+
+def _count_devices(networks: list, client) -> int:
+    """
+    Count devices across networks, skipping networks that fail.
+
+    Args:
+        networks: Networks returned by discover_networks
+        client: MerakiClient instance
+
+    Returns:
+        Total device count
+    """
+    device_count = 0
+    for network in networks:
+        try:
+            devices = client.get_network_devices(network.id)
+            device_count += len(devices)
+        except Exception as e:
+            logger.warning(f"Failed to count devices in network {network.id}: {e}")
+            continue
+    return device_count
+
+
+async def _count_devices_async(networks: list, client) -> int:
+    """
+    Count devices across networks concurrently via asyncio.to_thread().
+
+    Args:
+        networks: Networks returned by discover_networks
+        client: MerakiClient instance
+
+    Returns:
+        Total device count (failed networks are skipped)
+    """
+    results = await asyncio.gather(
+        *[asyncio.to_thread(client.get_network_devices, network.id) for network in networks],
+        return_exceptions=True,
+    )
+
+    device_count = 0
+    for network, devices in zip(networks, results):
+        if isinstance(devices, Exception):
+            logger.warning(f"Failed to count devices in network {network.id}: {devices}")
+            continue
+        device_count += len(devices)
+    return device_count
+
+
+def _store_context(
+    profile: str,
+    org_name: str,
+    org_id: str,
+    network_count: int,
+    device_count: int,
+    device_count_approx: bool = False,
+) -> NetworkContext:
+    """
+    Build a NetworkContext and store it in the cache.
+
+    Args:
+        profile: Meraki profile name
+        org_name: Organization name
+        org_id: Organization ID
+        network_count: Number of networks
+        device_count: Number of devices
+        device_count_approx: Whether device_count is a lower bound
+
+    Returns:
+        The cached NetworkContext
+    """
+    context = NetworkContext(
+        org_name=org_name,
+        org_id=org_id,
+        network_count=network_count,
+        device_count=device_count,
+        profile_name=profile,
+        timestamp=datetime.now(),
+        device_count_approx=device_count_approx,
+    )
+
+    _CONTEXT_CACHE[profile] = (context, datetime.now())
+    logger.info(
+        f"Network context cached for {profile}: "
+        f"{org_name}, {network_count} networks, {device_count} devices"
+    )
+
+    return context
+
+
 def get_network_context(profile: str) -> NetworkContext:
     """
     Get current network context for a profile with caching.
@@ -111,36 +236,61 @@ def get_network_context(profile: str) -> NetworkContext:
 
         # Get networks
         networks = discover_networks(org_id, client)
-        network_count = len(networks)
-
-        # Count devices across all networks
-        device_count = 0
-        for network in networks:
-            try:
-                devices = client.get_network_devices(network.id)
-                device_count += len(devices)
-            except Exception as e:
-                logger.warning(f"Failed to count devices in network {network.id}: {e}")
-                continue
-
-        context = NetworkContext(
-            org_name=org_name,
-            org_id=org_id,
-            network_count=network_count,
-            device_count=device_count,
-            profile_name=profile,
-            timestamp=datetime.now(),
-        )
 
-        # Cache it
-        _CONTEXT_CACHE[profile] = (context, datetime.now())
-        logger.info(
-            f"Network context cached for {profile}: "
-            f"{org_name}, {network_count} networks, {device_count} devices"
+        # Count devices across networks (capped for very large orgs)
+        counted, approx = _networks_to_count(networks)
+        device_count = _count_devices(counted, client)
+
+        return _store_context(
+            profile, org_name, org_id, len(networks), device_count, approx
         )
 
+    except Exception as e:
+        logger.error(f"Failed to get network context for {profile}: {e}")
+        raise ValueError(f"Cannot get network context: {e}") from e
+
+
+async def get_network_context_async(profile: str) -> NetworkContext:
+    """
+    Async version of get_network_context for use inside the event loop.
+
+    Blocking SDK calls run via asyncio.to_thread() and per-network device
+    counts are fetched concurrently. Shares the same cache as the sync version.
+
+    Args:
+        profile: Meraki profile name
+
+    Returns:
+        NetworkContext with current org/network/device info
+
+    Raises:
+        ValueError: If profile not found or API error
+    """
+    # Check cache
+    if _is_cache_valid(profile):
+        context, _ = _CONTEXT_CACHE[profile]
+        logger.debug(f"Using cached context for profile: {profile}")
         return context
 
+    # Import here to avoid circular dependency
+    from scripts.api import get_client
+    from scripts.discovery import discover_networks
+
+    try:
+        client = get_client()
+
+        org_data = await asyncio.to_thread(client.get_organization, client.org_id)
+        org_name = org_data["name"]
+        org_id = client.org_id
+
+        networks = await asyncio.to_thread(discover_networks, org_id, client)
+        counted, approx = _networks_to_count(networks)
+        device_count = await _count_devices_async(counted, client)
+
+        return _store_context(
+            profile, org_name, org_id, len(networks), device_count, approx
+        )
+
     except Exception as e:
         logger.error(f"Failed to get network context for {profile}: {e}")
         raise ValueError(f"Cannot get network context: {e}") from e
@@ -194,7 +344,7 @@ def load_agent_base_prompt(agent_name: str) -> str:
     Raises:
         FileNotFoundError: If agent definition not found
     """
-    agent_file = Path(".claude/agents") / f"{agent_name}.md"
+    agent_file = AGENT_PROMPT_DIR / f"{agent_name}.md"
 
     if not agent_file.exists():
         logger.error(f"Agent definition not found: {agent_file}")
@@ -209,44 +359,30 @@ def load_agent_base_prompt(agent_name: str) -> str:
         raise
 
 
-def build_system_prompt(agent_name: str, context: NetworkContext) -> str:
+def _assemble_prompt(agent_name: str, base_prompt: str, context: NetworkContext) -> str:
     """
-    Build complete system prompt for agent with network context.
-
-    Combines:
-    1. Base prompt from agent definition
-    2. Network context injection
-    3. Tool usage instructions
-    4. Safety guidelines
+    Assemble base prompt with context, tool and safety sections.
 
     Args:
-        agent_name: Name of agent
+        agent_name: Name of agent (selects safety wording)
+        base_prompt: Base prompt from agent definition
         context: Current network context
 
     Returns:
-        Complete system prompt ready for LLM
-
-    Raises:
-        FileNotFoundError: If agent definition not found
+        Complete system prompt
     """
-    # Load base prompt
-    base_prompt = load_agent_base_prompt(agent_name)
-
-    # Sanitize context values
-    org_name = _sanitize_context_value(context.org_name)
-    profile_name = _sanitize_context_value(context.profile_name)
-
-    # Build context section
+    # Build context section (context values are sanitized at construction)
+    devices = f"{context.device_count}+" if context.device_count_approx else context.device_count
     context_section = f"""
 
 ## Current Network Context
 
 You are currently managing the following Meraki organization:
 
-- **Organization**: {org_name} (ID: {context.org_id})
-- **Profile**: {profile_name}
+- **Organization**: {context.safe_org_name} (ID: {context.org_id})
+- **Profile**: {context.safe_profile_name}
 - **Networks**: {context.network_count}
-- **Devices**: {context.device_count}
+- **Devices**: {devices}
 - **Context Updated**: {context.timestamp.strftime('%Y-%m-%d %H:%M:%S')}
 
 Use this context to provide accurate, relevant responses to the user.
@@ -296,7 +432,30 @@ You have access to specialized tools to interact with the Meraki Dashboard API.
 """
 
     # Combine all sections
-    full_prompt = base_prompt + context_section + tool_instructions + safety_section
+    return base_prompt + context_section + tool_instructions + safety_section
+
+
+def build_system_prompt(agent_name: str, context: NetworkContext) -> str:
+    """
+    Build complete system prompt for agent with network context.
+
+    Combines:
+    1. Base prompt from agent definition
+    2. Network context injection
+    3. Tool usage instructions
+    4. Safety guidelines
+
+    Args:
+        agent_name: Name of agent
+        context: Current network context
+
+    Returns:
+        Complete system prompt ready for LLM
+
+    Raises:
+        FileNotFoundError: If agent definition not found
+    """
+    full_prompt = _assemble_prompt(agent_name, load_agent_base_prompt(agent_name), context)
 
     logger.debug(f"Built system prompt for {agent_name} ({len(full_prompt)} chars)")
 
@@ -366,6 +525,25 @@ def _cached_base_prompt(agent_name: str) -> str:
     return load_agent_base_prompt(agent_name)
 
 
+def get_agent_base_prompt(agent_name: str) -> str:
+    """
+    Base prompt for an agent, read from disk once per agent.
+
+    Shared by build_system_prompt_cached and the agent router, so each
+    prompt file is cached in one place.
+
+    Args:
+        agent_name: Name of agent
+
+    Returns:
+        Base prompt content
+
+    Raises:
+        FileNotFoundError: If agent definition not found
+    """
+    return _cached_base_prompt(agent_name)
+
+
 def build_system_prompt_cached(agent_name: str, profile: str) -> str:
     """
     Build system prompt with caching for base prompt.
@@ -383,69 +561,7 @@ def build_system_prompt_cached(agent_name: str, profile: str) -> str:
     context = get_network_context(profile)
 
     # Use cached base prompt
-    base_prompt = _cached_base_prompt(agent_name)
-
-    # Build full prompt (same logic as build_system_prompt but reuses base)
-    org_name = _sanitize_context_value(context.org_name)
-    profile_name = _sanitize_context_value(context.profile_name)
-
-    context_section = f"""
-
-## Current Network Context
-
-You are currently managing the following Meraki organization:
-
-- **Organization**: {org_name} (ID: {context.org_id})
-- **Profile**: {profile_name}
-- **Networks**: {context.network_count}
-- **Devices**: {context.device_count}
-- **Context Updated**: {context.timestamp.strftime('%Y-%m-%d %H:%M:%S')}
-
-Use this context to provide accurate, relevant responses to the user.
-"""
-
-    tool_instructions = """
-
-## Tool Usage Instructions
-
-You have access to specialized tools to interact with the Meraki Dashboard API.
-
-**IMPORTANT**:
-- Always use the provided tools to execute operations
-- Explain what you're doing before executing
-- Provide clear feedback after operations complete
-- If a tool call fails, explain the error to the user
-
-**Available Tools**:
-- Discovery tools: For network analysis and diagnostics
-- Configuration tools: For making network changes
-- Workflow tools: For creating automation workflows
-- Report tools: For generating documentation
-
-**Workflow**:
-1. Understand the user's request
-2. Explain what you plan to do
-3. Execute the appropriate tool(s)
-4. Summarize the results
-"""
-
-    safety_section = f"""
-
-## Safety Guidelines
-
-{'**CRITICAL - Configuration Changes**:' if agent_name == 'meraki-specialist' else '**Important**:'}
-- For configuration changes, ALWAYS:
-  1. Explain the impact of the change
-  2. Ask for user confirmation before executing
-  3. Create a backup before modifying
-  4. Verify the change after execution
-- Never execute destructive operations without explicit confirmation
-- If unsure, ask for clarification
-- Provide rollback instructions if something goes wrong
-
-"""
-
-    return base_prompt + context_section + tool_instructions + safety_section
+    return _assemble_prompt(agent_name, _cached_base_prompt(agent_name), context)
 
 
 # ==================== Main ====================
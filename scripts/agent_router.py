@@ -15,12 +15,20 @@ import inspect
 import json
 import logging
 import re
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
 from dataclasses import dataclass, field
+from datetime import datetime
 from enum import Enum
+from itertools import islice
 from pathlib import Path
+from types import MappingProxyType
 from typing import AsyncGenerator, Optional
 
-from scripts.agent_tools import get_agent_tools
+from scripts.agent_prompts import get_agent_base_prompt
+from scripts.agent_tools import get_agent_tools, is_parallel_safe
 from scripts.ai_engine import AIEngine, AIEngineError
 from scripts.executor_utils import (
     execute_function as _public_execute_function,
@@ -36,13 +44,18 @@ logger = logging.getLogger(__name__)
 # ==================== Data Classes ====================
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentDefinition:
-    """Definition of an agent with its capabilities."""
+    """
+    Definition of an agent with its capabilities.
+
+    A system_prompt of None is loaded from .claude/agents/{name}.md the
+    first time the agent handles a message.
+    """
 
     name: str
     description: str
-    system_prompt: str
+    system_prompt: Optional[str]
     functions: list[str]
     icon: str = "🤖"
     examples: list[str] = field(default_factory=list)
@@ -57,7 +70,7 @@ class AgentDefinition:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ClassificationResult:
     """Result of intent classification."""
 
@@ -66,18 +79,21 @@ class ClassificationResult:
     reasoning: str
     requires_confirmation: bool = False
     task_definition: Optional[TaskDefinition] = None
+    _dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> dict:
-        """Convert to dict for serialization."""
-        result = {
-            "agent_name": self.agent_name,
-            "confidence": self.confidence,
-            "reasoning": self.reasoning,
-            "requires_confirmation": self.requires_confirmation,
-        }
-        if self.task_definition:
-            result["task_name"] = self.task_definition.name
-        return result
+        """Convert to dict for serialization (built once, copied per call)."""
+        if self._dict is None:
+            result = {
+                "agent_name": self.agent_name,
+                "confidence": self.confidence,
+                "reasoning": self.reasoning,
+                "requires_confirmation": self.requires_confirmation,
+            }
+            if self.task_definition:
+                result["task_name"] = self.task_definition.name
+            object.__setattr__(self, "_dict", result)
+        return self._dict.copy()
 
 
 # ==================== Agent Registry ====================
@@ -87,17 +103,19 @@ def _load_agent_prompt(agent_name: str) -> str:
     """
     Load agent system prompt from .claude/agents/{agent_name}.md.
 
+    Served from the agent_prompts base-prompt cache; repeat loads do not
+    hit the disk.
+
     Args:
         agent_name: Name of the agent
 
     Returns:
         System prompt content or empty string if file not found
     """
-    prompt_path = Path(".claude/agents") / f"{agent_name}.md"
     try:
-        return prompt_path.read_text(encoding="utf-8")
+        return get_agent_base_prompt(agent_name)
     except (FileNotFoundError, OSError) as exc:
-        logger.warning(f"Agent prompt file not found: {prompt_path} ({exc})")
+        logger.warning(f"Agent prompt file not found: {agent_name} ({exc})")
         return ""
 
 
@@ -106,7 +124,7 @@ AGENTS = {
     "network-analyst": AgentDefinition(
         name="network-analyst",
         description="Network discovery, analysis, diagnostics, health checks",
-        system_prompt=_load_agent_prompt("network-analyst"),
+        system_prompt=None,
         functions=[
             "full_discovery",
             "discover_networks",
@@ -132,7 +150,7 @@ AGENTS = {
     "meraki-specialist": AgentDefinition(
         name="meraki-specialist",
         description="Configure ACL, Firewall, SSID, VLAN, Switch ports, Camera settings",
-        system_prompt=_load_agent_prompt("meraki-specialist"),
+        system_prompt=None,
         functions=[
             "configure_ssid",
             "enable_ssid",
@@ -157,7 +175,7 @@ AGENTS = {
     "workflow-creator": AgentDefinition(
         name="workflow-creator",
         description="Create automation workflows in Cisco/SecureX format",
-        system_prompt=_load_agent_prompt("workflow-creator"),
+        system_prompt=None,
         functions=[
             "create_device_offline_handler",
             "create_firmware_compliance_check",
@@ -175,6 +193,39 @@ AGENTS = {
     ),
 }
 
+# Intern agent names so AGENTS lookups and name comparisons can
+# short-circuit on identity; the registry is read-only after import
+AGENTS = MappingProxyType({
+    sys.intern(agent.name): dataclasses.replace(agent, name=sys.intern(agent.name))
+    for agent in AGENTS.values()
+})
+
+
+def _get_system_prompt(agent_name: str) -> str:
+    """
+    Resolve an agent's system prompt for the legacy LLM flow.
+
+    Prompt files are read on first use rather than at import, so only
+    agents that actually handle a message touch the disk.
+
+    Args:
+        agent_name: Name of an agent in AGENTS
+
+    Returns:
+        System prompt, or a generic one if the prompt file is missing
+    """
+    agent = AGENTS[agent_name]
+    prompt = agent.system_prompt
+    if prompt is None:
+        prompt = _load_agent_prompt(agent_name)
+    return prompt or f"You are {agent.name}. {agent.description}"
+
+
+# Agent list for LLM classification (AGENTS is fixed after import)
+_AGENTS_LIST_FOR_LLM = tuple(
+    {"name": agent.name, "description": agent.description} for agent in AGENTS.values()
+)
+
 
 # ==================== Function Registry ====================
 
@@ -263,6 +314,75 @@ def _get_task_registry() -> TaskRegistry:
 
 # ==================== Classification ====================
 
+# Characters of a message used for keyword scoring
+MAX_SANITIZED_CHARS = 500
+
+# Characters of a message considered by any classification tier;
+# the agent still receives the full message
+MAX_CLASSIFY_CHARS = 2000
+
+# Compiled once at import; used on every classification
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x1f\x7f-\x9f]")
+
+# Pattern-based matching with prioritization
+# Each agent has discovery patterns (what it does) and trigger keywords
+_AGENT_PATTERNS = {
+    "network-analyst": {
+        "keywords": [
+            r"\b(discover|scan|analyz\w*|diagnos\w*|health|status|offline|inventory|check|inspect|audit)\b",
+            r"\b(network|device|issue|problem|find|show|list|give|what|how many|do we have)\b",
+        ],
+        "weight": 1.0,
+    },
+    "meraki-specialist": {
+        "keywords": [
+            r"\b(config\w*|ssid|vlan|firewall|acl|switch|port|camera|block|allow|deny|secure)\b",
+            r"\b(create|add|update|modify|delete|remove|enable|disable|set|change|apply)\b",
+        ],
+        "weight": 1.2,  # Prioritize config actions
+    },
+    "workflow-creator": {
+        "keywords": [
+            r"\b(workflow|automat\w*|schedule|alert|notif\w*|trigger|template|remediat\w*|handler|compliance)\b",
+        ],
+        "weight": 1.5,  # Highly specific keywords
+    },
+}
+
+
+def _build_combined_pattern() -> tuple[
+    re.Pattern, dict[str, int], tuple[tuple[int, float], ...]
+]:
+    """
+    Fuse all agent keyword patterns into one regex with a named group each.
+
+    The keyword sets are disjoint whole words, so a single finditer() pass
+    yields the same matches as running every pattern separately.
+
+    Returns:
+        Tuple of (compiled pattern, group name -> keyword index,
+        (score slot, weight) per keyword index)
+    """
+    alternatives = []
+    group_index = {}
+    group_weights = []
+    for slot, agent_config in enumerate(_AGENT_PATTERNS.values()):
+        for pattern in agent_config["keywords"]:
+            group = f"g{len(group_weights)}"
+            alternatives.append(f"(?P<{group}>{pattern})")
+            group_index[group] = len(group_weights)
+            group_weights.append((slot, agent_config["weight"]))
+    return re.compile("|".join(alternatives)), group_index, tuple(group_weights)
+
+
+# Score slot -> agent name; _quick_classify scores into a fixed-size list
+_AGENT_NAMES: tuple[str, ...] = tuple(sys.intern(name) for name in _AGENT_PATTERNS)
+_ANALYST_SLOT = _AGENT_NAMES.index("network-analyst")
+_SPECIALIST_SLOT = _AGENT_NAMES.index("meraki-specialist")
+_WORKFLOW_SLOT = _AGENT_NAMES.index("workflow-creator")
+
+_COMBINED_PATTERN, _GROUP_INDEX, _GROUP_WEIGHTS = _build_combined_pattern()
+
 
 def _sanitize_input(text: str) -> str:
     """
@@ -275,145 +395,302 @@ def _sanitize_input(text: str) -> str:
         Sanitized text (truncated, safe characters only)
     """
     # Limit length
-    text = text[:500]
+    text = text[:MAX_SANITIZED_CHARS]
 
-    # Remove control characters
-    text = re.sub(r"[\x00-\x1f\x7f-\x9f]", "", text)
+    # Remove control characters (every one of them makes isprintable()
+    # False, so clean input skips the regex entirely)
+    if not text.isprintable():
+        text = _CONTROL_CHARS_RE.sub("", text)
 
     return text
 
 
-def _quick_classify(message: str) -> Optional[ClassificationResult]:
+# Explicit @-prefixes that bypass keyword scoring, in priority order.
+# Results are frozen, so each prefix maps to one shared instance.
+_PREFIX_MAP: tuple[tuple[tuple[str, str], ClassificationResult], ...] = tuple(
+    (
+        prefixes,
+        ClassificationResult(
+            agent_name=sys.intern(agent_name),
+            confidence=1.0,
+            reasoning=f"Explicit prefix {prefixes[0]}/{prefixes[1]}",
+            requires_confirmation=False,
+        ),
+    )
+    for agent_name, prefixes in (
+        ("network-analyst", ("@analyst", "@network")),
+        ("meraki-specialist", ("@specialist", "@config")),
+        ("workflow-creator", ("@workflow", "@automat")),
+    )
+)
+_ALL_PREFIXES: tuple[str, ...] = tuple(
+    prefix for prefixes, _ in _PREFIX_MAP for prefix in prefixes
+)
+_PREFIX_HEAD_LEN = max(map(len, _ALL_PREFIXES))
+
+
+def _match_prefix(message: str) -> Optional[ClassificationResult]:
     """
-    Quick rule-based classification using regex patterns.
+    Match an explicit @-prefix against the start of a message.
+
+    Only the first few characters are lowercased, so raw input can be
+    checked before sanitizing. Control characters never occur inside a
+    prefix; input where one precedes it is caught after sanitizing.
 
     Args:
-        message: User message to classify
+        message: Raw user message
 
     Returns:
-        ClassificationResult or None if no match
+        Shared prefix ClassificationResult, or None if no prefix matches
     """
-    # Sanitize input
-    message = _sanitize_input(message)
-    message_lower = message.lower()
+    head = message[:_PREFIX_HEAD_LEN].lower()
+    if head.startswith(_ALL_PREFIXES):
+        for prefixes, prefix_result in _PREFIX_MAP:
+            if head.startswith(prefixes):
+                return prefix_result
+    return None
 
-    # Check explicit prefix first
-    if message_lower.startswith("@analyst") or message_lower.startswith("@network"):
-        return ClassificationResult(
-            agent_name="network-analyst",
-            confidence=1.0,
-            reasoning="Explicit prefix @analyst/@network",
-            requires_confirmation=False,
-        )
 
-    if message_lower.startswith("@specialist") or message_lower.startswith("@config"):
-        return ClassificationResult(
-            agent_name="meraki-specialist",
-            confidence=1.0,
-            reasoning="Explicit prefix @specialist/@config",
-            requires_confirmation=False,
-        )
+def _quick_classify(
+    message: str, *, message_lower: Optional[str] = None
+) -> Optional[ClassificationResult]:
+    """
+    Quick rule-based classification using regex patterns.
 
-    if message_lower.startswith("@workflow") or message_lower.startswith("@automat"):
-        return ClassificationResult(
-            agent_name="workflow-creator",
-            confidence=1.0,
-            reasoning="Explicit prefix @workflow/@automat",
-            requires_confirmation=False,
-        )
+    Args:
+        message: User message to classify
+        message_lower: Already sanitized + lowercased message, if the
+            caller computed it (skips re-sanitizing)
 
-    # Pattern-based matching with prioritization
-    # Each agent has discovery patterns (what it does) and trigger keywords
-    patterns = {
-        "network-analyst": {
-            "keywords": [
-                r"\b(discover|scan|analyz\w*|diagnos\w*|health|status|offline|inventory|check|inspect|audit)\b",
-                r"\b(network|device|issue|problem|find|show|list|give|what|how many|do we have)\b",
-            ],
-            "weight": 1.0,
-        },
-        "meraki-specialist": {
-            "keywords": [
-                r"\b(config\w*|ssid|vlan|firewall|acl|switch|port|camera|block|allow|deny|secure)\b",
-                r"\b(create|add|update|modify|delete|remove|enable|disable|set|change|apply)\b",
-            ],
-            "weight": 1.2,  # Prioritize config actions
-        },
-        "workflow-creator": {
-            "keywords": [
-                r"\b(workflow|automat\w*|schedule|alert|notif\w*|trigger|template|remediat\w*|handler|compliance)\b",
-            ],
-            "weight": 1.5,  # Highly specific keywords
-        },
-    }
+    Returns:
+        ClassificationResult or None if no match
+    """
+    # Sanitize input (explicit prefixes on raw input skip it entirely)
+    if message_lower is None:
+        prefix_result = _match_prefix(message)
+        if prefix_result:
+            return prefix_result
+        message_lower = _sanitize_input(message).lower()
+
+    # Check explicit prefix first (one C-level check when no prefix is present)
+    if message_lower.startswith(_ALL_PREFIXES):
+        for prefixes, prefix_result in _PREFIX_MAP:
+            if message_lower.startswith(prefixes):
+                return prefix_result
 
     # Verb-aware pre-pass (Story 7.7 / HIGH-1)
-    has_action, has_analysis = detect_verb_type(message_lower)
-
-    # Count matches for each agent with weights
-    match_scores = {}
-    for agent_name, agent_config in patterns.items():
-        score = 0.0
-        matched_keywords = set()
-        for pattern in agent_config["keywords"]:
-            matches = re.findall(pattern, message_lower)
-            if matches:
-                # Add matched words to set to count unique keywords
-                matched_keywords.update(matches)
-                score += len(matches) * agent_config["weight"]
-        match_scores[agent_name] = score
+    has_action, has_analysis = detect_verb_type(message_lower, is_lower=True)
+
+    # Count matches per keyword (single scan), then weight each count once
+    # so scores add up exactly like len(matches) * weight per keyword
+    counts = [0] * len(_GROUP_WEIGHTS)
+    for match in _COMBINED_PATTERN.finditer(message_lower):
+        counts[_GROUP_INDEX[match.lastgroup]] += 1
+    scores = [0.0] * len(_AGENT_NAMES)
+    for count, (slot, weight) in zip(counts, _GROUP_WEIGHTS):
+        if count:
+            scores[slot] += count * weight
 
     # Apply verb-based score adjustments (only between analyst/specialist)
     # Workflow-creator is unaffected — its keywords are highly specific
     verb_boost = 0.0
-    wf_score = match_scores.get("workflow-creator", 0)
-    analyst_score = match_scores.get("network-analyst", 0)
-    specialist_score = match_scores.get("meraki-specialist", 0)
 
     # Only apply verb boost when workflow-creator has no matches
     # (workflow keywords are highly specific, verb boost shouldn't override them)
-    if wf_score == 0:
+    if scores[_WORKFLOW_SLOT] == 0:
         if has_action and not has_analysis:
             # Pure action intent → boost specialist, penalize analyst
-            match_scores["meraki-specialist"] = specialist_score + 2.0
-            match_scores["network-analyst"] = max(analyst_score - 1.0, 0)
+            scores[_SPECIALIST_SLOT] += 2.0
+            scores[_ANALYST_SLOT] = max(scores[_ANALYST_SLOT] - 1.0, 0.0)
             verb_boost = 2.0
         elif has_analysis and not has_action:
             # Pure analysis intent → boost analyst, penalize specialist
-            match_scores["network-analyst"] = analyst_score + 2.0
-            match_scores["meraki-specialist"] = max(specialist_score - 1.0, 0)
+            scores[_ANALYST_SLOT] += 2.0
+            scores[_SPECIALIST_SLOT] = max(scores[_SPECIALIST_SLOT] - 1.0, 0.0)
             verb_boost = 2.0
 
-    # Get best match
-    if match_scores:
-        best_agent = max(match_scores, key=match_scores.get)
-        best_score = match_scores[best_agent]
+    # Get best match (analyst, then specialist, then workflow win ties)
+    analyst_score = scores[_ANALYST_SLOT]
+    specialist_score = scores[_SPECIALIST_SLOT]
+    wf_score = scores[_WORKFLOW_SLOT]
+    if analyst_score >= specialist_score and analyst_score >= wf_score:
+        best_slot, best_score = _ANALYST_SLOT, analyst_score
+    elif specialist_score >= wf_score:
+        best_slot, best_score = _SPECIALIST_SLOT, specialist_score
+    else:
+        best_slot, best_score = _WORKFLOW_SLOT, wf_score
+
+    if best_score > 0:
+        best_agent = _AGENT_NAMES[best_slot]
+
+        # Calculate confidence (normalize to 0.6-0.95 range)
+        confidence = min(0.6 + (best_score * 0.1), 0.95)
+        reasoning = f"Pattern match (score: {best_score:.1f})"
+        if verb_boost > 0:
+            reasoning += f", verb-aware boost applied"
 
-        if best_score > 0:
-            # Calculate confidence (normalize to 0.6-0.95 range)
-            confidence = min(0.6 + (best_score * 0.1), 0.95)
-            reasoning = f"Pattern match (score: {best_score:.1f})"
-            if verb_boost > 0:
-                reasoning += f", verb-aware boost applied"
-
-            return ClassificationResult(
-                agent_name=best_agent,
-                confidence=confidence,
-                reasoning=reasoning,
-                requires_confirmation=confidence < 0.7,
-            )
+        return ClassificationResult(
+            agent_name=best_agent,
+            confidence=confidence,
+            reasoning=reasoning,
+            requires_confirmation=confidence < 0.7,
+        )
 
     # No match
     return None
 
 
-async def _llm_classify(message: str, ai_engine: AIEngine) -> ClassificationResult:
+# ==================== Classification Cache ====================
+
+# LLM classification results keyed by (provider, model, message fingerprint);
+# switching engines or models must not reuse another model's answers
+_LLM_CLASSIFY_CACHE: OrderedDict[
+    tuple[Optional[str], Optional[str], str], tuple[ClassificationResult, datetime]
+] = OrderedDict()
+LLM_CACHE_MAX_ENTRIES = 256
+LLM_CACHE_TTL_SECONDS = 3600  # 1 hour
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _message_fingerprint(message: str) -> str:
+    """
+    Normalize a message to its lowercase word tokens.
+
+    Messages differing only in case, punctuation or spacing share a
+    fingerprint (e.g. "Analyze the network!" and "analyze  the network").
+
+    Args:
+        message: User message
+
+    Returns:
+        Space-joined lowercase word tokens
+    """
+    return " ".join(_WORD_RE.findall(message.lower()))
+
+
+def _engine_identity(ai_engine: AIEngine) -> tuple[Optional[str], Optional[str]]:
+    """
+    Provider and model an engine currently answers with.
+
+    Read on every call: update_settings() can switch them in place, and
+    cached answers from one model must not be served for another.
+
+    Args:
+        ai_engine: AIEngine instance
+
+    Returns:
+        Tuple of (provider, model)
+    """
+    return getattr(ai_engine, "provider", None), getattr(ai_engine, "model", None)
+
+
+def _get_cached_llm_result(
+    key: tuple[Optional[str], Optional[str], str],
+) -> Optional[ClassificationResult]:
+    """
+    Look up a cached LLM classification, dropping it if expired.
+
+    Args:
+        key: (provider, model, message fingerprint)
+
+    Returns:
+        Cached ClassificationResult, or None on miss
+    """
+    entry = _LLM_CLASSIFY_CACHE.get(key)
+    if entry is None:
+        return None
+
+    result, cached_time = entry
+    if (datetime.now() - cached_time).total_seconds() >= LLM_CACHE_TTL_SECONDS:
+        del _LLM_CLASSIFY_CACHE[key]
+        return None
+
+    _LLM_CLASSIFY_CACHE.move_to_end(key)
+    return result
+
+
+def _store_llm_result(
+    key: tuple[Optional[str], Optional[str], str], result: ClassificationResult
+) -> None:
+    """
+    Cache an LLM classification, evicting the least recently used entry.
+
+    Args:
+        key: (provider, model, message fingerprint)
+        result: Classification returned by the LLM
+    """
+    _LLM_CLASSIFY_CACHE[key] = (result, datetime.now())
+    _LLM_CLASSIFY_CACHE.move_to_end(key)
+    while len(_LLM_CLASSIFY_CACHE) > LLM_CACHE_MAX_ENTRIES:
+        _LLM_CLASSIFY_CACHE.popitem(last=False)
+
+
+# Final classify_intent results keyed by (lowercase message as the task
+# matcher sees it, task registry version or None when tasks are disabled,
+# (provider, model) of the AI engine or None without one)
+_IntentKey = tuple[str, Optional[int], Optional[tuple[Optional[str], Optional[str]]]]
+_INTENT_CACHE: OrderedDict[_IntentKey, ClassificationResult] = OrderedDict()
+_INTENT_CACHE_LOCK = threading.Lock()
+INTENT_CACHE_MAX_ENTRIES = 1024
+
+
+def _get_cached_intent(key: _IntentKey) -> Optional[ClassificationResult]:
+    """
+    Look up an exact-match classify_intent result.
+
+    Args:
+        key: Intent cache key
+
+    Returns:
+        Cached ClassificationResult, or None on miss
+    """
+    with _INTENT_CACHE_LOCK:
+        result = _INTENT_CACHE.get(key)
+        if result is not None:
+            _INTENT_CACHE.move_to_end(key)
+    return result
+
+
+def _store_intent(key: _IntentKey, result: ClassificationResult) -> None:
+    """
+    Cache a classify_intent result unless it is a low-confidence guess.
+
+    Task matches are not cached: they are cheap to recompute and must
+    follow the task registry contents.
+
+    Args:
+        key: Intent cache key
+        result: Final classification
+    """
+    if result.confidence < 0.7 or result.task_definition is not None:
+        return
+
+    with _INTENT_CACHE_LOCK:
+        _INTENT_CACHE[key] = result
+        _INTENT_CACHE.move_to_end(key)
+        while len(_INTENT_CACHE) > INTENT_CACHE_MAX_ENTRIES:
+            _INTENT_CACHE.popitem(last=False)
+
+
+def clear_classification_cache() -> None:
+    """Clear all cached classification results."""
+    _LLM_CLASSIFY_CACHE.clear()
+    with _INTENT_CACHE_LOCK:
+        _INTENT_CACHE.clear()
+    logger.debug("Classification cache cleared")
+
+
+async def _llm_classify(
+    message: str, ai_engine: AIEngine, *, message_lower: Optional[str] = None
+) -> ClassificationResult:
     """
     LLM-based classification using AIEngine.classify().
 
     Args:
         message: User message to classify
         ai_engine: AIEngine instance
+        message_lower: Already sanitized + lowercased message, if known
 
     Returns:
         ClassificationResult
@@ -421,34 +698,46 @@ async def _llm_classify(message: str, ai_engine: AIEngine) -> ClassificationResu
     Raises:
         AIEngineError: If classification fails
     """
-    # Build agent list for classification
-    agents_list = [
-        {"name": agent.name, "description": agent.description}
-        for agent in AGENTS.values()
-    ]
+    # Repeated or trivially reworded messages skip the LLM round-trip
+    fingerprint = _message_fingerprint(message)
+    cache_key = (*_engine_identity(ai_engine), fingerprint)
+    cached = _get_cached_llm_result(cache_key) if fingerprint else None
+    if cached:
+        logger.debug(f"LLM classification cache hit: {cached.agent_name}")
+        return cached
 
     try:
-        result = await ai_engine.classify(message, agents_list, session_id="router")
+        result = await ai_engine.classify(
+            message, _AGENTS_LIST_FOR_LLM, session_id="router"
+        )
 
         agent_name = result.get("agent", "network-analyst")
+        if isinstance(agent_name, str):
+            # Same object as the AGENTS key, so lookups hit the identity check
+            agent_name = sys.intern(agent_name)
         confidence = result.get("confidence", 0.5)
         reasoning = result.get("reasoning", "LLM classification")
 
-        return ClassificationResult(
+        classification = ClassificationResult(
             agent_name=agent_name,
             confidence=confidence,
             reasoning=reasoning,
             requires_confirmation=confidence < 0.7,
         )
+        if fingerprint:
+            _store_llm_result(cache_key, classification)
+        return classification
 
     except (AIEngineError, Exception) as exc:
         logger.warning(f"LLM classification failed: {exc}")
         # Fallback to quick classify with lower confidence
-        quick_result = _quick_classify(message)
+        quick_result = _quick_classify(message, message_lower=message_lower)
         if quick_result:
-            quick_result.confidence *= 0.8  # Reduce confidence
-            quick_result.reasoning += " (LLM unavailable)"
-            return quick_result
+            return dataclasses.replace(
+                quick_result,
+                confidence=quick_result.confidence * 0.8,  # Reduce confidence
+                reasoning=quick_result.reasoning + " (LLM unavailable)",
+            )
 
         # Ultimate fallback
         return ClassificationResult(
@@ -479,11 +768,69 @@ async def classify_intent(
         ai_engine: Optional AIEngine instance
         settings: Optional Settings instance for feature flags
 
+    Returns:
+        ClassificationResult with agent selection and confidence
+    """
+    use_modular = True
+    if settings:
+        use_modular = getattr(settings, "use_modular_tasks", True)
+
+    # Explicit prefix: answered from the message head alone
+    prefix_result = _match_prefix(message)
+    if prefix_result:
+        logger.info(f"Explicit prefix: {prefix_result.agent_name}")
+        return prefix_result
+
+    # Oversized input: every tier sees only the head, so pathological
+    # messages cost no more than a long legitimate one
+    if len(message) > MAX_CLASSIFY_CHARS:
+        message = message[:MAX_CLASSIFY_CHARS]
+
+    # Sanitize + lowercase once; reused by every tier below
+    message_lower = _sanitize_input(message).lower()
+
+    # Exact-match cache: repeats skip regex scoring and the LLM round-trip.
+    # Keyed on the text find_matching_task sees (it lowercases too), so two
+    # messages that sanitize alike but match different tasks never collide.
+    # The registry version and engine identity retire entries computed
+    # against an older task set or a different model.
+    cache_key = (
+        message.lower(),
+        _get_task_registry().version if use_modular else None,
+        _engine_identity(ai_engine) if ai_engine is not None else None,
+    )
+    cached = _get_cached_intent(cache_key)
+    if cached:
+        logger.info(
+            f"Cached classify: {cached.agent_name} (confidence: {cached.confidence:.2f})"
+        )
+        return cached
+
+    result = await _classify_uncached(message, message_lower, ai_engine, use_modular)
+    _store_intent(cache_key, result)
+    return result
+
+
+async def _classify_uncached(
+    message: str,
+    message_lower: str,
+    ai_engine: Optional[AIEngine],
+    use_modular: bool,
+) -> ClassificationResult:
+    """
+    Run the classify_intent pipeline without the exact-match cache.
+
+    Args:
+        message: User message to classify
+        message_lower: Sanitized + lowercased message
+        ai_engine: Optional AIEngine instance
+        use_modular: Whether to check the task registry
+
     Returns:
         ClassificationResult with agent selection and confidence
     """
     # Try quick classify first (handles explicit prefix at confidence=1.0)
-    quick_result = _quick_classify(message)
+    quick_result = _quick_classify(message, message_lower=message_lower)
 
     # If explicit prefix (confidence=1.0), use it immediately
     if quick_result and quick_result.confidence == 1.0:
@@ -493,10 +840,6 @@ async def classify_intent(
         return quick_result
 
     # Task registry check (after prefix, before regex/LLM) — Story 7.3 / HIGH-1
-    use_modular = True
-    if settings:
-        use_modular = getattr(settings, "use_modular_tasks", True)
-
     if use_modular:
         registry = _get_task_registry()
         task_match = registry.find_matching_task(message)
@@ -521,7 +864,9 @@ async def classify_intent(
     # Try LLM classify if available
     if ai_engine:
         try:
-            llm_result = await _llm_classify(message, ai_engine)
+            llm_result = await _llm_classify(
+                message, ai_engine, message_lower=message_lower
+            )
             logger.info(
                 f"LLM classify: {llm_result.agent_name} "
                 f"(confidence: {llm_result.confidence:.2f})"
@@ -564,14 +909,107 @@ async def _execute_function(
     return await _public_execute_function(func_name, args, FUNCTION_REGISTRY)
 
 
+# Parallel-safe tool calls from one turn in flight at once (Meraki API rate limit)
+MAX_CONCURRENT_TOOL_CALLS = 8
+
+
+async def _run_tool_calls(
+    calls: list[tuple[str, dict]],
+) -> AsyncGenerator[tuple[str, tuple[bool, Optional[dict], Optional[str]]], None]:
+    """
+    Execute the tool calls from one model turn, in call order.
+
+    Consecutive calls to parallel-safe tools (see is_parallel_safe) run
+    concurrently, at most MAX_CONCURRENT_TOOL_CALLS at a time. Every
+    other call runs alone, after the calls before it have finished, so
+    dependent pairs such as save_snapshot -> compare_snapshots keep the
+    order the model asked for.
+
+    Args:
+        calls: (function name, arguments) pairs
+
+    Yields:
+        Tuple of (function name, _execute_function result)
+    """
+    limit = asyncio.Semaphore(MAX_CONCURRENT_TOOL_CALLS)
+
+    async def run_limited(func_name: str, func_args: dict):
+        async with limit:
+            return await _execute_function(func_name, func_args)
+
+    i = 0
+    while i < len(calls):
+        func_name, func_args = calls[i]
+        if not is_parallel_safe(func_name):
+            yield func_name, await _execute_function(func_name, func_args)
+            i += 1
+            continue
+
+        run_end = i + 1
+        while run_end < len(calls) and is_parallel_safe(calls[run_end][0]):
+            run_end += 1
+        run = calls[i:run_end]
+        outcomes = await asyncio.gather(
+            *(run_limited(name, args) for name, args in run)
+        )
+        for (name, _), outcome in zip(run, outcomes):
+            yield name, outcome
+        i = run_end
+
+
 # ==================== Message Processing ====================
 
 
+# Session history messages forwarded to the LLM per request
+MAX_CONTEXT_MESSAGES = 20
+
+# Streamed content is coalesced until this many characters are buffered
+# or this long has passed since the last stream event
+STREAM_FLUSH_CHARS = 64
+STREAM_FLUSH_SECONDS = 0.01
+
+
+def _extract_delta(chunk: object) -> tuple[Optional[str], Optional[list]]:
+    """
+    Pull the content and tool-call deltas out of a streaming chunk.
+
+    LiteLLM normalizes every provider to the OpenAI chunk shape, so the
+    delta is indexed directly; chunks without one yield (None, None).
+
+    Args:
+        chunk: Streaming chunk from AIEngine.chat_completion
+
+    Returns:
+        Tuple of (content, tool_call deltas)
+    """
+    try:
+        delta = chunk.choices[0].delta
+    except (AttributeError, IndexError, TypeError):
+        return None, None
+    return getattr(delta, "content", None), getattr(delta, "tool_calls", None)
+
+
+def _stream_event(buffer: list[str], agent_name: str) -> dict:
+    """
+    Drain buffered content deltas into one stream event.
+
+    Args:
+        buffer: Pending content fragments (cleared in place)
+        agent_name: Agent producing the content
+
+    Returns:
+        Stream event dict
+    """
+    chunk = "".join(buffer)
+    buffer.clear()
+    return {"type": "stream", "chunk": chunk, "agent": agent_name}
+
+
 async def process_message(
     message: str,
     session_id: str = "default",
     ai_engine: Optional[AIEngine] = None,
-    session_context: Optional[list] = None,
+    session_context: Optional[Sequence[dict]] = None,
     settings: Optional[Settings] = None,
 ) -> AsyncGenerator[dict, None]:
     """
@@ -586,7 +1024,8 @@ async def process_message(
         message: User message to process
         session_id: Session identifier for context
         ai_engine: Optional AIEngine instance
-        session_context: Optional list of previous messages (last 20)
+        session_context: Optional sequence of previous messages (last 20
+            are used; a list or collections.deque)
         settings: Optional Settings for feature flags
 
     Yields:
@@ -657,18 +1096,19 @@ async def process_message(
         }
         return
 
-    # Build system prompt
-    system_prompt = agent.system_prompt or f"You are {agent.name}. {agent.description}"
-
-    # Build messages
-    messages = [{"role": "system", "content": system_prompt}]
-
-    # Add session context (last 20 messages)
-    if session_context:
-        messages.extend(session_context[-20:])
-
-    # Add current message
-    messages.append({"role": "user", "content": message})
+    # System prompt (loaded on the agent's first message)
+    system_prompt = _get_system_prompt(agent.name)
+
+    # Build messages in one allocation: system prompt, session context
+    # (last MAX_CONTEXT_MESSAGES; callers usually pass an already-trimmed
+    # list or deque, which is unpacked as-is), current message
+    context = session_context or ()
+    overflow = len(context) - MAX_CONTEXT_MESSAGES
+    messages = [
+        {"role": "system", "content": system_prompt},
+        *(islice(context, overflow, None) if overflow > 0 else context),
+        {"role": "user", "content": message},
+    ]
 
     # If no AI engine, return error
     if not ai_engine:
@@ -684,6 +1124,13 @@ async def process_message(
     except ValueError:
         tools = []
 
+    # Content deltas are coalesced and flushed once STREAM_FLUSH_CHARS
+    # accumulate or STREAM_FLUSH_SECONDS pass, so fast token streams do
+    # not cost one event per token
+    loop = asyncio.get_running_loop()
+    stream_buffer: list[str] = []
+    buffered_chars = 0
+
     # Call AI Engine with function-calling
     try:
         response_stream = await ai_engine.chat_completion(
@@ -693,56 +1140,126 @@ async def process_message(
             session_id=session_id,
         )
 
-        # Stream response chunks
-        async for chunk in response_stream:
-            # Check for tool calls
-            if hasattr(chunk, "choices") and len(chunk.choices) > 0:
-                choice = chunk.choices[0]
+        # Tool calls by provider index, run in index order; the name arrives
+        # first and the JSON arguments are streamed in fragments, joined
+        # once the stream ends
+        pending_tool_calls: dict[int, dict] = {}
+        last_flush = loop.time()
+        received_content = False
+
+        # Stream response chunks. While text is buffered, the next chunk is
+        # awaited against the flush deadline so a stalled stream still
+        # delivers it. asyncio.wait leaves the pending read running on
+        # timeout (wait_for would cancel it, closing the stream)
+        stream_iter = aiter(response_stream)
+        next_chunk: Optional[asyncio.Future] = None
+        try:
+            while True:
+                if stream_buffer:
+                    if next_chunk is None:
+                        next_chunk = asyncio.ensure_future(anext(stream_iter))
+                    deadline = last_flush + STREAM_FLUSH_SECONDS - loop.time()
+                    done, _ = await asyncio.wait((next_chunk,), timeout=max(deadline, 0))
+                    if not done:
+                        yield _stream_event(stream_buffer, agent.name)
+                        buffered_chars = 0
+                        last_flush = loop.time()
+                        continue
+
+                try:
+                    if next_chunk is not None:
+                        chunk = await next_chunk
+                    else:
+                        chunk = await anext(stream_iter)
+                except StopAsyncIteration:
+                    break
+                finally:
+                    next_chunk = None
+                content, tool_calls = _extract_delta(chunk)
 
                 # Stream delta content
-                if hasattr(choice, "delta") and hasattr(choice.delta, "content"):
-                    content = choice.delta.content
-                    if content:
-                        yield {
-                            "type": "stream",
-                            "chunk": content,
-                            "agent": agent.name,
-                        }
-
-                # Check for tool calls
-                if hasattr(choice.delta, "tool_calls") and choice.delta.tool_calls:
-                    for tool_call in choice.delta.tool_calls:
-                        if hasattr(tool_call, "function"):
-                            func_name = tool_call.function.name
-                            func_args_str = tool_call.function.arguments
-
-                            try:
-                                func_args = json.loads(func_args_str) if func_args_str else {}
-                            except json.JSONDecodeError:
-                                func_args = {}
-
-                            # Execute function
-                            success, result, error = await _execute_function(
-                                func_name, func_args
-                            )
-
-                            if success:
-                                yield {
-                                    "type": "function_result",
-                                    "function": func_name,
-                                    "result": result,
-                                    "agent": agent.name,
-                                }
-                            else:
-                                yield {
-                                    "type": "function_error",
-                                    "function": func_name,
-                                    "error": error,
-                                    "agent": agent.name,
-                                }
+                if content:
+                    received_content = True
+                    stream_buffer.append(content)
+                    buffered_chars += len(content)
+                    now = loop.time()
+                    if (
+                        buffered_chars >= STREAM_FLUSH_CHARS
+                        or now - last_flush >= STREAM_FLUSH_SECONDS
+                    ):
+                        yield _stream_event(stream_buffer, agent.name)
+                        buffered_chars = 0
+                        last_flush = now
+
+                # Text ends where tool calls begin: send it before the
+                # (possibly long) argument stream
+                if tool_calls and stream_buffer:
+                    yield _stream_event(stream_buffer, agent.name)
+                    buffered_chars = 0
+                    last_flush = loop.time()
+
+                # Accumulate tool call deltas
+                if tool_calls:
+                    for tool_call in tool_calls:
+                        function = getattr(tool_call, "function", None)
+                        if function is None:
+                            continue
+                        idx = getattr(tool_call, "index", None)
+                        if idx is None:
+                            # Providers without indices send each call whole
+                            idx = max(pending_tool_calls, default=-1) + 1
+                        pending = pending_tool_calls.get(idx)
+                        if pending is None:
+                            pending = pending_tool_calls[idx] = {"name": None, "arguments": []}
+                        if function.name:
+                            pending["name"] = function.name
+                        if function.arguments:
+                            pending["arguments"].append(function.arguments)
+        finally:
+            if next_chunk is not None:
+                next_chunk.cancel()
+
+        if stream_buffer:
+            yield _stream_event(stream_buffer, agent.name)
+        if not received_content and not pending_tool_calls:
+            # Degenerate provider response: no content, no tool calls
+            logger.warning(f"Empty LLM response for agent {agent.name}")
+
+        # Parse tool calls once their arguments are complete
+        parsed_calls = []
+        for idx in sorted(pending_tool_calls):
+            tc = pending_tool_calls[idx]
+            if not tc["name"]:
+                continue
+            func_args_str = "".join(tc["arguments"])
+            try:
+                func_args = json.loads(func_args_str) if func_args_str else {}
+            except json.JSONDecodeError:
+                func_args = {}
+            # Interned: matches the TOOL_SAFETY / FUNCTION_REGISTRY keys by identity
+            parsed_calls.append((sys.intern(tc["name"]), func_args))
+
+        # Execute functions
+        async for func_name, (success, result, error) in _run_tool_calls(parsed_calls):
+            if success:
+                yield {
+                    "type": "function_result",
+                    "function": func_name,
+                    "result": result,
+                    "agent": agent.name,
+                }
+            else:
+                yield {
+                    "type": "function_error",
+                    "function": func_name,
+                    "error": error,
+                    "agent": agent.name,
+                }
 
     except Exception as exc:
         logger.exception("Error in process_message")
+        if stream_buffer:
+            yield _stream_event(stream_buffer, agent.name)
         yield {
             "type": "error",
             "error": "Processing failed. Check server logs for details.",
@@ -12,6 +12,7 @@ All tools map to functions in FUNCTION_REGISTRY (agent_router.py).
 
 import logging
 from enum import Enum
+from types import MappingProxyType
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -27,8 +28,8 @@ class SafetyLevel(Enum):
     DANGEROUS = "dangerous"  # Disruptive, hard to reverse
 
 
-# Tool safety classifications
-TOOL_SAFETY = {
+# Tool safety classifications (read-only; _NO_CONFIRMATION is derived from it)
+TOOL_SAFETY = MappingProxyType({
     # Safe (read-only)
     "full_discovery": SafetyLevel.SAFE,
     "discover_networks": SafetyLevel.SAFE,
@@ -68,7 +69,34 @@ TOOL_SAFETY = {
     "sgt_preflight_check": SafetyLevel.SAFE,
     "check_license": SafetyLevel.SAFE,
     "backup_current_state": SafetyLevel.SAFE,
-}
+})
+
+# Tools that run without confirmation. Everything else needs it,
+# including unknown tools (get_tool_safety defaults them to MODERATE).
+_NO_CONFIRMATION: frozenset[str] = frozenset(
+    name for name, safety in TOOL_SAFETY.items() if safety is SafetyLevel.SAFE
+)
+
+
+# Tools that only read (Meraki API or their arguments) and touch no local
+# state, so calls from one turn may run concurrently. SAFE is not enough:
+# snapshot, backup and workflow tools write files that later calls read.
+# Everything else, including unknown tools, runs in call order.
+_PARALLEL_SAFE: frozenset[str] = frozenset({
+    "full_discovery",
+    "discover_networks",
+    "discover_devices",
+    "discover_ssids",
+    "discover_vlans",
+    "discover_firewall_rules",
+    "discover_switch_ports",
+    "discover_switch_acls",
+    "find_issues",
+    "generate_suggestions",
+    "detect_catalyst_mode",
+    "sgt_preflight_check",
+    "check_license",
+})
 
 
 def get_tool_safety(tool_name: str) -> SafetyLevel:
@@ -94,14 +122,46 @@ def requires_confirmation(tool_name: str) -> bool:
     Returns:
         True if confirmation required
     """
-    safety = get_tool_safety(tool_name)
-    return safety in [SafetyLevel.MODERATE, SafetyLevel.DANGEROUS]
+    return tool_name not in _NO_CONFIRMATION
+
+
+def is_parallel_safe(tool_name: str) -> bool:
+    """
+    Check if a tool may run concurrently with other calls from the same turn.
+
+    Args:
+        tool_name: Name of the tool
+
+    Returns:
+        True if the tool is read-only and independent of local state
+    """
+    return tool_name in _PARALLEL_SAFE
+
+
+# ==================== Shared Parameter Schemas ====================
+
+# Parameter schemas repeated across tools; each is one shared object
+_NETWORK_ID = {"type": "string", "description": "Network ID"}
+_SSID_NUMBER = {
+    "type": "integer",
+    "description": "SSID number (0-14)",
+    "minimum": 0,
+    "maximum": 14,
+}
+_BACKUP_CLIENT_NAME = {"type": "string", "description": "Client name for backup (optional)"}
+_SERIAL = {"type": "string", "description": "Device serial number"}
+_RULE_POLICY = {
+    "type": "string",
+    "enum": ["allow", "deny"],
+    "description": "Allow or deny traffic",
+}
+_RULE_COMMENT = {"type": "string", "description": "Descriptive comment for the rule"}
 
 
 # ==================== Tool Definitions ====================
 
 # Network Analyst Tools
-NETWORK_ANALYST_TOOLS = [
+NETWORK_ANALYST_TOOLS = (
     {
         "type": "function",
         "function": {
@@ -327,10 +387,10 @@ NETWORK_ANALYST_TOOLS = [
             },
         },
     },
-]
+)
 
 # Meraki Specialist Tools
-MERAKI_SPECIALIST_TOOLS = [
+MERAKI_SPECIALIST_TOOLS = (
     {
         "type": "function",
         "function": {
@@ -339,16 +399,8 @@ MERAKI_SPECIALIST_TOOLS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "network_id": {
-                        "type": "string",
-                        "description": "Network ID",
-                    },
-                    "ssid_number": {
-                        "type": "integer",
-                        "description": "SSID number (0-14)",
-                        "minimum": 0,
-                        "maximum": 14,
-                    },
+                    "network_id": _NETWORK_ID,
+                    "ssid_number": _SSID_NUMBER,
                     "name": {
                         "type": "string",
                         "description": "SSID name (optional)",
@@ -366,10 +418,7 @@ MERAKI_SPECIALIST_TOOLS = [
                         "type": "string",
                         "description": "Pre-shared key if auth_mode is psk (optional)",
                     },
-                    "client_name": {
-                        "type": "string",
-                        "description": "Client name for backup (optional)",
-                    },
+                    "client_name": _BACKUP_CLIENT_NAME,
                 },
                 "required": ["network_id", "ssid_number"],
                 "additionalProperties": False,
@@ -384,18 +433,10 @@ MERAKI_SPECIALIST_TOOLS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "network_id": {"type": "string", "description": "Network ID"},
-                    "ssid_number": {
-                        "type": "integer",
-                        "description": "SSID number (0-14)",
-                        "minimum": 0,
-                        "maximum": 14,
-                    },
+                    "network_id": _NETWORK_ID,
+                    "ssid_number": _SSID_NUMBER,
                     "name": {"type": "string", "description": "SSID name"},
-                    "client_name": {
-                        "type": "string",
-                        "description": "Client name for backup (optional)",
-                    },
+                    "client_name": _BACKUP_CLIENT_NAME,
                 },
                 "required": ["network_id", "ssid_number", "name"],
                 "additionalProperties": False,
@@ -410,17 +451,9 @@ MERAKI_SPECIALIST_TOOLS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "network_id": {"type": "string", "description": "Network ID"},
-                    "ssid_number": {
-                        "type": "integer",
-                        "description": "SSID number (0-14)",
-                        "minimum": 0,
-                        "maximum": 14,
-                    },
-                    "client_name": {
-                        "type": "string",
-                        "description": "Client name for backup (optional)",
-                    },
+                    "network_id": _NETWORK_ID,
+                    "ssid_number": _SSID_NUMBER,
+                    "client_name": _BACKUP_CLIENT_NAME,
                 },
                 "required": ["network_id", "ssid_number"],
                 "additionalProperties": False,
@@ -435,7 +468,7 @@ MERAKI_SPECIALIST_TOOLS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "network_id": {"type": "string", "description": "Network ID"},
+                    "network_id": _NETWORK_ID,
                     "vlan_id": {"type": "integer", "description": "VLAN ID number"},
                     "name": {"type": "string", "description": "VLAN name"},
                     "subnet": {
@@ -446,10 +479,7 @@ MERAKI_SPECIALIST_TOOLS = [
                         "type": "string",
                         "description": "Gateway IP address (e.g., 192.168.10.1)",
                     },
-                    "client_name": {
-                        "type": "string",
-                        "description": "Client name for backup (optional)",
-                    },
+                    "client_name": _BACKUP_CLIENT_NAME,
                 },
                 "required": ["network_id", "vlan_id", "name", "subnet", "appliance_ip"],
                 "additionalProperties": False,
@@ -464,7 +494,7 @@ MERAKI_SPECIALIST_TOOLS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "network_id": {"type": "string", "description": "Network ID"},
+                    "network_id": _NETWORK_ID,
                     "vlan_id": {"type": "string", "description": "VLAN ID"},
                     "name": {"type": "string", "description": "VLAN name (optional)"},
                     "subnet": {"type": "string", "description": "Subnet CIDR (optional)"},
@@ -502,10 +532,7 @@ MERAKI_SPECIALIST_TOOLS = [
                             },
                         },
                     },
-                    "client_name": {
-                        "type": "string",
-                        "description": "Client name for backup (optional)",
-                    },
+                    "client_name": _BACKUP_CLIENT_NAME,
                 },
                 "required": ["network_id", "vlan_id"],
                 "additionalProperties": False,
@@ -520,12 +547,9 @@ MERAKI_SPECIALIST_TOOLS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "network_id": {"type": "string", "description": "Network ID"},
+                    "network_id": _NETWORK_ID,
                     "vlan_id": {"type": "string", "description": "VLAN ID to delete"},
-                    "client_name": {
-                        "type": "string",
-                        "description": "Client name for backup (optional)",
-                    },
+                    "client_name": _BACKUP_CLIENT_NAME,
                 },
                 "required": ["network_id", "vlan_id"],
                 "additionalProperties": False,
@@ -540,12 +564,8 @@ MERAKI_SPECIALIST_TOOLS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "network_id": {"type": "string", "description": "Network ID"},
-                    "policy": {
-                        "type": "string",
-                        "enum": ["allow", "deny"],
-                        "description": "Allow or deny traffic",
-                    },
+                    "network_id": _NETWORK_ID,
+                    "policy": _RULE_POLICY,
                     "protocol": {
                         "type": "string",
                         "enum": ["tcp", "udp", "icmp", "any"],
@@ -563,14 +583,8 @@ MERAKI_SPECIALIST_TOOLS = [
                         "type": "string",
                         "description": "Destination port (e.g., '80', '443', 'any')",
                     },
-                    "comment": {
-                        "type": "string",
-                        "description": "Descriptive comment for the rule",
-                    },
-                    "client_name": {
-                        "type": "string",
-                        "description": "Client name for backup (optional)",
-                    },
+                    "comment": _RULE_COMMENT,
+                    "client_name": _BACKUP_CLIENT_NAME,
                 },
                 "required": [
                     "network_id",
@@ -592,15 +606,12 @@ MERAKI_SPECIALIST_TOOLS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "network_id": {"type": "string", "description": "Network ID"},
+                    "network_id": _NETWORK_ID,
                     "rule_index": {
                         "type": "integer",
                         "description": "Index of rule to remove (0-based)",
                     },
-                    "client_name": {
-                        "type": "string",
-                        "description": "Client name for backup (optional)",
-                    },
+                    "client_name": _BACKUP_CLIENT_NAME,
                 },
                 "required": ["network_id", "rule_index"],
                 "additionalProperties": False,
@@ -615,12 +626,8 @@ MERAKI_SPECIALIST_TOOLS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "network_id": {"type": "string", "description": "Network ID"},
-                    "policy": {
-                        "type": "string",
-                        "enum": ["allow", "deny"],
-                        "description": "Allow or deny traffic",
-                    },
+                    "network_id": _NETWORK_ID,
+                    "policy": _RULE_POLICY,
                     "protocol": {
                         "type": "string",
                         "enum": ["tcp", "udp", "any"],
@@ -646,14 +653,8 @@ MERAKI_SPECIALIST_TOOLS = [
                         "type": "string",
                         "description": "VLAN ID or 'any' (default: 'any')",
                     },
-                    "comment": {
-                        "type": "string",
-                        "description": "Descriptive comment for the rule",
-                    },
-                    "client_name": {
-                        "type": "string",
-                        "description": "Client name for backup (optional)",
-                    },
+                    "comment": _RULE_COMMENT,
+                    "client_name": _BACKUP_CLIENT_NAME,
                 },
                 "required": [
                     "network_id",
@@ -676,7 +677,7 @@ MERAKI_SPECIALIST_TOOLS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "network_id": {"type": "string", "description": "Network ID"},
+                    "network_id": _NETWORK_ID,
                     "client_name": {
                         "type": "string",
                         "description": "Client name for backup organization",
@@ -718,10 +719,7 @@ MERAKI_SPECIALIST_TOOLS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "serial": {
-                        "type": "string",
-                        "description": "Device serial number",
-                    }
+                    "serial": _SERIAL
                 },
                 "required": ["serial"],
                 "additionalProperties": False,
@@ -754,10 +752,7 @@ MERAKI_SPECIALIST_TOOLS = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "serial": {
-                        "type": "string",
-                        "description": "Device serial number",
-                    }
+                    "serial": _SERIAL
                 },
                 "required": ["serial"],
                 "additionalProperties": False,
@@ -791,10 +786,10 @@ MERAKI_SPECIALIST_TOOLS = [
             },
         },
     },
-]
+)
 
 # Workflow Creator Tools
-WORKFLOW_CREATOR_TOOLS = [
+WORKFLOW_CREATOR_TOOLS = (
     {
         "type": "function",
         "function": {
@@ -930,7 +925,7 @@ WORKFLOW_CREATOR_TOOLS = [
             },
         },
     },
-]
+)
 
 # ==================== Tool Registry ====================
 
@@ -940,11 +935,23 @@ AGENT_TOOLS = {
     "workflow-creator": WORKFLOW_CREATOR_TOOLS,
 }
 
+# Listed in get_agent_tools errors
+_AVAILABLE_AGENTS = ", ".join(AGENT_TOOLS)
+
+# Tool definition by function name, across all agents
+ALL_TOOLS_BY_NAME = MappingProxyType({
+    tool["function"]["name"]: tool for tools in AGENT_TOOLS.values() for tool in tools
+})
+
 
 def get_agent_tools(agent_name: str) -> list[dict]:
     """
     Get tool definitions for an agent.
 
+    The definitions are built once at import as immutable tuples; each
+    call returns a fresh list over them, so a caller mutating its list
+    cannot affect any other request.
+
     Args:
         agent_name: Name of agent (network-analyst, meraki-specialist, workflow-creator)
 
@@ -954,17 +961,30 @@ def get_agent_tools(agent_name: str) -> list[dict]:
     Raises:
         ValueError: If agent not found
     """
-    if agent_name not in AGENT_TOOLS:
-        available = ", ".join(AGENT_TOOLS.keys())
+    try:
+        tools = list(AGENT_TOOLS[agent_name])
+    except KeyError:
         raise ValueError(
-            f"Agent '{agent_name}' not found. Available: {available}"
-        )
+            f"Agent '{agent_name}' not found. Available: {_AVAILABLE_AGENTS}"
+        ) from None
 
-    tools = AGENT_TOOLS[agent_name]
     logger.debug(f"Retrieved {len(tools)} tools for agent: {agent_name}")
     return tools
 
 
+def get_tool_schema(tool_name: str) -> Optional[dict]:
+    """
+    Get the tool definition for a function name, whichever agent owns it.
+
+    Args:
+        tool_name: Name of the tool
+
+    Returns:
+        Tool definition in OpenAI function-calling format, or None if unknown
+    """
+    return ALL_TOOLS_BY_NAME.get(tool_name)
+
+
 def validate_tool_schema(tool: dict) -> tuple[bool, Optional[str]]:
     """
     Validate that tool definition follows OpenAI function-calling schema.
@@ -1013,51 +1033,82 @@ def validate_tool_schema(tool: dict) -> tuple[bool, Optional[str]]:
     return True, None
 
 
+def _validate_all_tools() -> None:
+    """
+    Validate every tool definition in AGENT_TOOLS.
+
+    Tool names must also be unique across agents, since
+    ALL_TOOLS_BY_NAME keys on them.
+
+    Raises:
+        ValueError: If any tool definition is invalid or a name repeats
+    """
+    errors = []
+    seen: set[str] = set()
+    for agent_name, tools in AGENT_TOOLS.items():
+        for tool in tools:
+            valid, error = validate_tool_schema(tool)
+            name = tool.get("function", {}).get("name")
+            if not valid:
+                errors.append(f"{agent_name}/{name}: {error}")
+            elif name in seen:
+                errors.append(f"{agent_name}/{name}: duplicate tool name")
+            seen.add(name)
+    if errors:
+        raise ValueError(f"Invalid tool schemas: {'; '.join(errors)}")
+
+
+# Tool definitions are static, so they are checked once at import
+# (skipped under python -O)
+_VALIDATED = False
+if __debug__:
+    _validate_all_tools()
+    _VALIDATED = True
+
+
 # ==================== Main ====================
 
 if __name__ == "__main__":
     import sys
     import json
 
+    # -q: report through the exit code only (e.g. when run as a health check)
+    quiet = "-q" in sys.argv[1:]
+    say = (lambda *args, **kwargs: None) if quiet else print
+
     logging.basicConfig(
-        level=logging.DEBUG, format="%(levelname)s: %(message)s"
+        level=logging.WARNING if quiet else logging.DEBUG,
+        format="%(levelname)s: %(message)s",
     )
 
     try:
-        print("\n=== Testing agent_tools.py ===\n")
+        say("\n=== Testing agent_tools.py ===\n")
 
         # Test 1: Get tools for each agent
-        print("1. Getting tools for each agent...")
+        say("1. Getting tools for each agent...")
         for agent in ["network-analyst", "meraki-specialist", "workflow-creator"]:
             tools = get_agent_tools(agent)
-            print(f"  {agent}: {len(tools)} tools")
+            say(f"  {agent}: {len(tools)} tools")
 
         # Test 2: Validate all tool schemas
-        print("\n2. Validating tool schemas...")
-        all_valid = True
-        for agent_name, tools in AGENT_TOOLS.items():
-            for tool in tools:
-                valid, error = validate_tool_schema(tool)
-                if not valid:
-                    print(f"  ERROR in {agent_name}/{tool.get('function', {}).get('name')}: {error}")
-                    all_valid = False
-
-        if all_valid:
-            print("  All tool schemas valid!")
+        say("\n2. Validating tool schemas...")
+        if _VALIDATED:
+            say("  (pre-validated at import)")
         else:
-            raise ValueError("Tool schema validation failed")
+            _validate_all_tools()
+        say("  All tool schemas valid!")
 
         # Test 3: Check safety classifications
-        print("\n3. Checking safety classifications...")
+        say("\n3. Checking safety classifications...")
         for tool_name, safety in TOOL_SAFETY.items():
-            print(f"  {tool_name}: {safety.value}")
+            say(f"  {tool_name}: {safety.value}")
 
         # Test 4: Sample tool JSON
-        print("\n4. Sample tool definition (full_discovery):")
+        say("\n4. Sample tool definition (full_discovery):")
         sample_tool = NETWORK_ANALYST_TOOLS[0]
-        print(json.dumps(sample_tool, indent=2)[:500] + "...")
+        say(json.dumps(sample_tool, indent=2)[:500] + "...")
 
-        print("\n=== All tests passed ===\n")
+        say("\n=== All tests passed ===\n")
 
     except Exception as e:
         print(f"\nError: {e}")
@@ -11,6 +11,7 @@ Wraps LiteLLM for provider-agnostic completions with:
 
 import asyncio
 import logging
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import AsyncGenerator, Optional
 
@@ -263,14 +264,14 @@ class AIEngine:
         session.call_count += 1
 
     async def classify(
-        self, message: str, agents: list[dict], session_id: str = "default"
+        self, message: str, agents: Sequence[dict], session_id: str = "default"
     ) -> dict:
         """
         Classify message to route to appropriate agent.
 
         Args:
             message: User message to classify
-            agents: List of agent dicts with name and description
+            agents: Sequence of agent dicts with name and description
             session_id: Session identifier for token tracking
 
         Returns:
@@ -8,22 +8,39 @@ Created: Story 7.1 (CRITICAL-1 amendment)
 """
 
 import asyncio
+import atexit
+import contextvars
 import dataclasses
 import inspect
 import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import Path
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 
+# Dedicated pool for registry functions (network-bound Meraki API calls),
+# so they never queue behind other asyncio.to_thread() work
+IO_MAX_WORKERS = 64
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=IO_MAX_WORKERS, thread_name_prefix="meraki-io")
+atexit.register(_IO_EXECUTOR.shutdown, wait=False)
+
+# Exact types serialize_result returns unchanged
+_PRIMITIVE_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
 def serialize_result(obj: object) -> object:
     """
     Recursively serialize a function return value to JSON-safe types.
 
     Handles dataclasses, Path, Enum, objects with to_dict(), and
-    nested lists/dicts.
+    nested lists/dicts. Plain dicts and lists that are already JSON-safe
+    are returned as-is rather than copied.
 
     Args:
         obj: Any Python object to serialize
@@ -31,7 +48,16 @@ def serialize_result(obj: object) -> object:
     Returns:
         JSON-serializable Python object
     """
-    if obj is None or isinstance(obj, (str, int, float, bool)):
+    # Fast paths on the exact type: the bulk of API payloads
+    obj_type = type(obj)
+    if obj_type in _PRIMITIVE_TYPES:
+        return obj
+    if obj_type is dict:
+        return _serialize_dict(obj)
+    if obj_type is list:
+        return _serialize_list(obj)
+
+    if isinstance(obj, (str, int, float, bool)):
         return obj
     if isinstance(obj, Path):
         return str(obj)
@@ -48,11 +74,95 @@ def serialize_result(obj: object) -> object:
     return str(obj)
 
 
+def _serialize_dict(obj: dict) -> dict:
+    """Serialize a plain dict, copying only once a key or value changes."""
+    result = None
+    for index, (key, value) in enumerate(obj.items()):
+        serialized = serialize_result(value)
+        if result is None:
+            if serialized is value and type(key) is str:
+                continue
+            result = dict(islice(obj.items(), index))
+        result[str(key)] = serialized
+    return obj if result is None else result
+
+
+def _serialize_list(items: list) -> list:
+    """Serialize a plain list, copying only once an item changes."""
+    result = None
+    for index, item in enumerate(items):
+        serialized = serialize_result(item)
+        if result is None:
+            if serialized is item:
+                continue
+            result = items[:index]
+        result.append(serialized)
+    return items if result is None else result
+
+
+# (settings file path, mtime_ns) -> Settings from the last load
+_settings_cache: Optional[tuple[tuple[str, int], object]] = None
+
+
+def _load_settings():
+    """
+    Load settings, re-reading the file only when it has changed.
+
+    SettingsManager.load() reads and decrypts the settings file; tool
+    calls in one turn reuse the result until the file's mtime changes.
+
+    Returns:
+        Current Settings
+    """
+    global _settings_cache
+    from scripts.settings import SettingsManager
+
+    manager = SettingsManager()
+    try:
+        key = (str(manager.SETTINGS_FILE), manager.SETTINGS_FILE.stat().st_mtime_ns)
+    except OSError:
+        # No settings file yet: load() returns defaults without disk reads
+        return manager.load()
+
+    cached = _settings_cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    settings = manager.load()
+    _settings_cache = (key, settings)
+    return settings
+
+
+@lru_cache(maxsize=256)
+def _cached_param_names(func: Callable) -> frozenset[str]:
+    """Memoized _param_names for hashable callables."""
+    return frozenset(inspect.signature(func).parameters)
+
+
+def _param_names(func: Callable) -> frozenset[str]:
+    """
+    Parameter names of a registry function, computed once per function.
+
+    Unhashable callables (e.g. instances defining __eq__ without
+    __hash__) are inspected on every call instead of cached.
+
+    Args:
+        func: Registered callable
+
+    Returns:
+        Frozenset of parameter names from inspect.signature()
+    """
+    try:
+        return _cached_param_names(func)
+    except TypeError:
+        return frozenset(inspect.signature(func).parameters)
+
+
 async def execute_function(
     func_name: str, args: dict, function_registry: dict
 ) -> tuple[bool, Optional[dict], Optional[str]]:
     """
-    Execute a function from the registry via asyncio.to_thread().
+    Execute a function from the registry on the dedicated I/O thread pool.
 
     Auto-injects ``client``, ``client_name``, and ``org_id`` when the
     target function accepts them and they are not already provided by
@@ -73,8 +183,7 @@ async def execute_function(
         return False, None, error
 
     try:
-        sig = inspect.signature(func)
-        params = sig.parameters
+        params = _param_names(func)
 
         # Auto-inject client and client_name from settings
         needs_client = "client" in params and "client" not in args
@@ -82,9 +191,7 @@ async def execute_function(
 
         if needs_client or needs_client_name:
             try:
-                from scripts.settings import SettingsManager
-
-                settings = SettingsManager().load()
+                settings = _load_settings()
                 profile = settings.meraki_profile or "default"
 
                 if needs_client:
@@ -102,9 +209,13 @@ async def execute_function(
             if client and hasattr(client, "org_id"):
                 args["org_id"] = client.org_id
 
-        # Execute via asyncio.to_thread() to avoid blocking
+        # Execute on the I/O pool to avoid blocking (context propagated
+        # like asyncio.to_thread())
         logger.debug(f"Executing function: {func_name} with args: {list(args.keys())}")
-        result = await asyncio.to_thread(func, **args)
+        ctx = contextvars.copy_context()
+        result = await asyncio.get_running_loop().run_in_executor(
+            _IO_EXECUTOR, partial(ctx.run, func, **args)
+        )
 
         logger.info(f"Function {func_name} executed successfully")
         return True, {"result": serialize_result(result)}, None
@@ -178,12 +178,26 @@ class TaskRegistry:
 
     def __init__(self) -> None:
         self._tasks: dict[str, TaskDefinition] = {}
+        # Task name -> (task, single-word keywords, multi-word keywords), lowercased
+        self._keyword_index: dict[
+            str, tuple[TaskDefinition, tuple[str, ...], tuple[str, ...]]
+        ] = {}
+        self._version = 0
 
     @property
     def tasks(self) -> dict[str, TaskDefinition]:
         """All registered tasks keyed by name."""
         return dict(self._tasks)
 
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever the task set changes.
+
+        Callers caching results derived from the registry include it in
+        their cache keys, so stale entries stop matching after a change.
+        """
+        return self._version
+
     def load_tasks(self, directory: Path) -> dict[str, TaskDefinition]:
         """Scan directory recursively for task .md files.
 
@@ -203,6 +217,7 @@ class TaskRegistry:
             try:
                 task = parse_task_file(md_file)
                 self._tasks[task.name] = task
+                self._version += 1
                 loaded += 1
                 logger.debug(f"Loaded task: {task.name} from {md_file}")
             except TaskParseError as exc:
@@ -220,6 +235,31 @@ class TaskRegistry:
             task: The task definition to register
         """
         self._tasks[task.name] = task
+        self._version += 1
+
+    def _task_keywords(self, task: TaskDefinition) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        """Lowercased trigger keywords for a task, split by word count.
+
+        Built once per task object, so matching does not re-lowercase every
+        keyword on every message. Replacing a task (register_task, reload)
+        rebuilds its entry.
+
+        Args:
+            task: Task whose keywords to index
+
+        Returns:
+            Tuple of (single-word keywords, multi-word keywords)
+        """
+        entry = self._keyword_index.get(task.name)
+        if entry is None or entry[0] is not task:
+            lowered = [keyword.lower() for keyword in task.trigger_keywords]
+            entry = (
+                task,
+                tuple(kw for kw in lowered if " " not in kw),
+                tuple(kw for kw in lowered if " " in kw),
+            )
+            self._keyword_index[task.name] = entry
+        return entry[1], entry[2]
 
     def find_matching_task(self, message: str) -> Optional[TaskDefinition]:
         """Find the best matching task for a user message.
@@ -241,7 +281,7 @@ class TaskRegistry:
 
         message_lower = message.lower()
         message_words = set(message_lower.split())
-        has_action, has_analysis = detect_verb_type(message)
+        has_action, has_analysis = detect_verb_type(message_lower, is_lower=True)
 
         best_task: Optional[TaskDefinition] = None
         best_score: float = 0.0
@@ -250,17 +290,16 @@ class TaskRegistry:
             if not task.trigger_keywords:
                 continue
 
-            # Count keyword matches (whole word, case-insensitive)
+            # Count keyword matches (whole word, case-insensitive;
+            # multi-word keywords: check substring)
+            single_words, multi_words = self._task_keywords(task)
             keyword_count = 0
-            for keyword in task.trigger_keywords:
-                kw_lower = keyword.lower()
-                # Multi-word keywords: check substring
-                if " " in kw_lower:
-                    if kw_lower in message_lower:
-                        keyword_count += 1
-                else:
-                    if kw_lower in message_words:
-                        keyword_count += 1
+            for kw_lower in single_words:
+                if kw_lower in message_words:
+                    keyword_count += 1
+            for kw_lower in multi_words:
+                if kw_lower in message_lower:
+                    keyword_count += 1
 
             if keyword_count == 0:
                 continue
@@ -308,6 +347,8 @@ class TaskRegistry:
             dirs = {Path(directory)}
 
         self._tasks.clear()
+        self._keyword_index.clear()
+        self._version += 1
         for d in dirs:
             self.load_tasks(d)
 
@@ -65,16 +65,18 @@ ANALYSIS_VERBS: frozenset[str] = frozenset({
 })
 
 
-def detect_verb_type(message: str) -> tuple[bool, bool]:
+def detect_verb_type(message: str, *, is_lower: bool = False) -> tuple[bool, bool]:
     """Detect whether a message contains action and/or analysis verbs.
 
     Args:
         message: User message text
+        is_lower: Set when the caller already lowercased the message
 
     Returns:
         Tuple of (has_action_verb, has_analysis_verb)
     """
-    words = set(message.lower().split())
-    has_action = bool(words & ACTION_VERBS)
-    has_analysis = bool(words & ANALYSIS_VERBS)
+    # isdisjoint() stops at the first hit and builds no intermediate sets
+    words = (message if is_lower else message.lower()).split()
+    has_action = not ACTION_VERBS.isdisjoint(words)
+    has_analysis = not ANALYSIS_VERBS.isdisjoint(words)
     return has_action, has_analysis
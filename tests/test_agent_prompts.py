@@ -9,15 +9,20 @@ Tests:
 - Conversation history trimming
 """
 
+import dataclasses
 import json
 import pytest
 from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 from scripts.agent_prompts import (
     NetworkContext,
     build_system_prompt,
+    build_system_prompt_cached,
     get_network_context,
+    get_network_context_async,
     invalidate_context_cache,
     load_agent_base_prompt,
     trim_conversation_history,
@@ -25,9 +30,12 @@ from scripts.agent_prompts import (
 )
 from scripts.agent_tools import (
     AGENT_TOOLS,
+    ALL_TOOLS_BY_NAME,
     SafetyLevel,
     get_agent_tools,
     get_tool_safety,
+    get_tool_schema,
+    is_parallel_safe,
     requires_confirmation,
     validate_tool_schema,
     TOOL_SAFETY,
@@ -123,6 +131,17 @@ def test_build_system_prompt_meraki_specialist_safety(mock_network_context):
     assert "backup" in prompt.lower()
 
 
+def test_build_system_prompt_cached_matches_uncached(mock_network_context):
+    """Test cached and uncached builders produce identical prompts."""
+    with patch(
+        "scripts.agent_prompts.get_network_context", return_value=mock_network_context
+    ):
+        for agent in ["network-analyst", "meraki-specialist", "workflow-creator"]:
+            assert build_system_prompt_cached(agent, "test-profile") == build_system_prompt(
+                agent, mock_network_context
+            )
+
+
 def test_trim_conversation_history_no_system():
     """Test trimming when no system message."""
     messages = [{"role": "user", "content": f"Message {i}"} for i in range(30)]
@@ -160,6 +179,92 @@ def test_trim_conversation_history_empty():
     assert trimmed == []
 
 
+# ==================== Network Context Tests ====================
+
+
+def test_network_context_is_frozen(mock_network_context):
+    """Test NetworkContext is immutable and slotted."""
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        mock_network_context.org_name = "Other"
+    assert not hasattr(mock_network_context, "__dict__")
+
+
+def test_network_context_sanitized_once(mock_network_context):
+    """Test prompt-safe values are computed at construction and on replace."""
+    context = dataclasses.replace(mock_network_context, org_name='Org "A"\nB')
+    assert context.org_name == 'Org "A"\nB'
+    assert context.safe_org_name == 'Org \\"A\\" B'
+    assert context.safe_profile_name == "test-profile"
+
+
+@pytest.fixture
+def mock_meraki_client():
+    """Mock Meraki client with three networks, one failing device fetch."""
+    client = MagicMock()
+    client.org_id = "123456"
+    client.get_organization.return_value = {"name": "Test Organization"}
+
+    def _devices(network_id):
+        if network_id == "N_3":
+            raise RuntimeError("API error")
+        return [{"serial": f"{network_id}-1"}, {"serial": f"{network_id}-2"}]
+
+    client.get_network_devices.side_effect = _devices
+    return client
+
+
+@pytest.fixture
+def mock_networks():
+    """Mock discovered networks."""
+    return [SimpleNamespace(id=f"N_{i}") for i in range(1, 4)]
+
+
+def test_get_network_context_counts_devices(mock_meraki_client, mock_networks):
+    """Test sync context fetch skips failing networks."""
+    invalidate_context_cache()
+    with patch("scripts.api.get_client", return_value=mock_meraki_client), patch(
+        "scripts.discovery.discover_networks", return_value=mock_networks
+    ):
+        context = get_network_context("ctx-sync")
+
+    assert context.network_count == 3
+    assert context.device_count == 4
+    invalidate_context_cache()
+
+
+@pytest.mark.asyncio
+async def test_get_network_context_async_matches_sync(mock_meraki_client, mock_networks):
+    """Test async context fetch gives the same counts and populates the cache."""
+    invalidate_context_cache()
+    with patch("scripts.api.get_client", return_value=mock_meraki_client), patch(
+        "scripts.discovery.discover_networks", return_value=mock_networks
+    ):
+        context = await get_network_context_async("ctx-async")
+        cached = get_network_context("ctx-async")
+
+    assert context.org_name == "Test Organization"
+    assert context.network_count == 3
+    assert context.device_count == 4
+    assert cached is context
+    invalidate_context_cache()
+
+
+def test_get_network_context_caps_device_counting(mock_meraki_client, mock_networks):
+    """Test device counting stops at MAX_NETWORKS_TO_COUNT and is flagged approximate."""
+    invalidate_context_cache()
+    with patch("scripts.api.get_client", return_value=mock_meraki_client), patch(
+        "scripts.discovery.discover_networks", return_value=mock_networks
+    ), patch("scripts.agent_prompts.MAX_NETWORKS_TO_COUNT", 2):
+        context = get_network_context("ctx-capped")
+
+    assert context.network_count == 3
+    assert context.device_count == 4
+    assert context.device_count_approx is True
+    assert mock_meraki_client.get_network_devices.call_count == 2
+    assert "**Devices**: 4+" in build_system_prompt("network-analyst", context)
+    invalidate_context_cache()
+
+
 # ==================== Tool Definition Tests ====================
 
 
@@ -172,10 +277,39 @@ def test_get_agent_tools():
         assert all(isinstance(t, dict) for t in tools)
 
 
+def test_agent_tool_collections_are_tuples():
+    """Test module-level tool collections cannot be appended to."""
+    for agent_name, tools in AGENT_TOOLS.items():
+        assert isinstance(tools, tuple)
+        assert get_agent_tools(agent_name) == list(tools)
+
+
+def test_get_agent_tools_returns_independent_lists():
+    """Test mutating one caller's tool list does not leak into the next."""
+    tools = get_agent_tools("network-analyst")
+    expected = len(tools)
+    tools.clear()
+    assert len(get_agent_tools("network-analyst")) == expected
+
+
 def test_get_agent_tools_invalid_agent():
     """Test retrieving tools for non-existent agent."""
-    with pytest.raises(ValueError):
+    with pytest.raises(ValueError) as exc_info:
         get_agent_tools("non-existent-agent")
+    assert str(exc_info.value) == (
+        "Agent 'non-existent-agent' not found. "
+        "Available: network-analyst, meraki-specialist, workflow-creator"
+    )
+    assert exc_info.value.__cause__ is None
+
+
+def test_get_tool_schema():
+    """Test tool definitions are indexed by name across agents."""
+    assert len(ALL_TOOLS_BY_NAME) == sum(len(tools) for tools in AGENT_TOOLS.values())
+    for tools in AGENT_TOOLS.values():
+        for tool in tools:
+            assert get_tool_schema(tool["function"]["name"]) is tool
+    assert get_tool_schema("unknown_tool") is None
 
 
 def test_all_tool_schemas_valid():
@@ -186,6 +320,38 @@ def test_all_tool_schemas_valid():
             assert valid, f"Invalid tool schema in {agent_name}: {error}"
 
 
+def test_repeated_parameter_schemas_are_shared():
+    """Test identical parameter schemas are one object across tools."""
+    network_ids = {
+        id(tool["function"]["parameters"]["properties"]["network_id"])
+        for tools in AGENT_TOOLS.values()
+        for tool in tools
+        if tool["function"]["parameters"]["properties"].get("network_id")
+        == {"type": "string", "description": "Network ID"}
+    }
+    assert len(network_ids) == 1
+
+
+def test_validate_all_tools_reports_invalid_schema():
+    """Test the import-time check names the offending tool."""
+    from scripts.agent_tools import _validate_all_tools
+
+    broken = {"type": "function", "function": {"name": "broken_tool"}}
+    with patch.dict("scripts.agent_tools.AGENT_TOOLS", {"test-agent": (broken,)}):
+        with pytest.raises(ValueError, match="test-agent/broken_tool"):
+            _validate_all_tools()
+
+
+def test_validate_all_tools_reports_duplicate_names():
+    """Test a tool name reused across agents is rejected."""
+    from scripts.agent_tools import _validate_all_tools
+
+    tools = {"a": (get_tool_schema("find_issues"),), "b": (get_tool_schema("find_issues"),)}
+    with patch.dict("scripts.agent_tools.AGENT_TOOLS", tools, clear=True):
+        with pytest.raises(ValueError, match="b/find_issues: duplicate tool name"):
+            _validate_all_tools()
+
+
 def test_tool_schema_has_required_fields():
     """Test that each tool has required fields."""
     for agent_name, tools in AGENT_TOOLS.items():
@@ -307,6 +473,30 @@ def test_requires_confirmation():
     assert requires_confirmation("add_firewall_rule")
 
 
+def test_requires_confirmation_matches_safety():
+    """Test confirmation follows get_tool_safety, including unknown tools."""
+    for tool_name in [*TOOL_SAFETY, "unknown_tool"]:
+        assert requires_confirmation(tool_name) == (
+            get_tool_safety(tool_name) is not SafetyLevel.SAFE
+        )
+
+
+def test_parallel_safe_tools():
+    """Test only read-only SAFE tools may run concurrently."""
+    assert is_parallel_safe("discover_vlans")
+    for tool_name in ["save_snapshot", "backup_config", "save_workflow", "unknown_tool"]:
+        assert not is_parallel_safe(tool_name)
+    for tool_name in TOOL_SAFETY:
+        if is_parallel_safe(tool_name):
+            assert get_tool_safety(tool_name) is SafetyLevel.SAFE
+
+
+def test_tool_safety_is_read_only():
+    """Test TOOL_SAFETY cannot drift from the sets derived from it."""
+    with pytest.raises(TypeError):
+        TOOL_SAFETY["delete_vlan"] = SafetyLevel.SAFE
+
+
 def test_all_tools_have_safety_classification():
     """Test that all tools in AGENT_TOOLS have safety classification."""
     for agent_name, tools in AGENT_TOOLS.items():
@@ -399,8 +589,10 @@ def test_tool_retrieval_is_fast():
 
 def test_context_with_special_characters(mock_network_context):
     """Test context injection with special characters."""
-    mock_network_context.org_name = 'Test "Org" with <special> chars'
-    prompt = build_system_prompt("network-analyst", mock_network_context)
+    context = dataclasses.replace(
+        mock_network_context, org_name='Test "Org" with <special> chars'
+    )
+    prompt = build_system_prompt("network-analyst", context)
 
     # Should be sanitized
     assert "\x00" not in prompt
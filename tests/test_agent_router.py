@@ -5,23 +5,42 @@ Tests classification, function execution, and message processing.
 """
 
 import asyncio
+import dataclasses
 import json
+from collections import deque
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 
+from scripts.agent_prompts import _cached_base_prompt, load_agent_base_prompt
 from scripts.agent_router import (
     AGENTS,
     FUNCTION_REGISTRY,
+    MAX_CLASSIFY_CHARS,
+    MAX_CONCURRENT_TOOL_CALLS,
     AgentDefinition,
     ClassificationResult,
     _execute_function,
+    _get_system_prompt,
+    _load_agent_prompt,
     _quick_classify,
     _sanitize_input,
     classify_intent,
+    clear_classification_cache,
     process_message,
 )
+from scripts.task_models import TaskDefinition
+from scripts.task_registry import TaskRegistry
+
+
+@pytest.fixture(autouse=True)
+def _clear_classification_cache():
+    """Isolate tests from results cached by earlier classifications."""
+    clear_classification_cache()
+    yield
+    clear_classification_cache()
 
 
 # ==================== Test Data Classes ====================
@@ -67,6 +86,34 @@ def test_classification_result_creation():
     assert result_dict["confidence"] == 0.95
 
 
+def test_classification_result_to_dict_returns_copies():
+    """Test cached to_dict output cannot be changed through a returned dict."""
+    result = ClassificationResult(
+        agent_name="network-analyst",
+        confidence=0.95,
+        reasoning="Pattern match",
+    )
+
+    first = result.to_dict()
+    first["agent_name"] = "tampered"
+
+    assert result.to_dict()["agent_name"] == "network-analyst"
+    assert result == ClassificationResult("network-analyst", 0.95, "Pattern match")
+
+
+def test_classification_result_is_frozen():
+    """Test ClassificationResult cannot be mutated once built."""
+    result = ClassificationResult(
+        agent_name="network-analyst",
+        confidence=0.95,
+        reasoning="Pattern match",
+    )
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.confidence = 0.5
+    assert not hasattr(result, "__dict__")
+
+
 # ==================== Test Agent Registry ====================
 
 
@@ -85,6 +132,45 @@ def test_agents_registry():
     assert analyst.icon == "🔍"
 
 
+def test_agents_registry_is_read_only():
+    """Test AGENTS cannot be modified after import."""
+    with pytest.raises(TypeError):
+        AGENTS["rogue-agent"] = AGENTS["network-analyst"]
+
+
+def test_agent_prompts_load_on_first_use(tmp_path):
+    """Test prompt files are read when first needed, then reused."""
+    assert all(agent.system_prompt is None for agent in AGENTS.values())
+    (tmp_path / "workflow-creator.md").write_text("Workflow prompt", encoding="utf-8")
+
+    _cached_base_prompt.cache_clear()
+    try:
+        with patch("scripts.agent_prompts.AGENT_PROMPT_DIR", tmp_path):
+            assert _get_system_prompt("workflow-creator") == "Workflow prompt"
+            (tmp_path / "workflow-creator.md").unlink()
+            assert _get_system_prompt("workflow-creator") == "Workflow prompt"
+            assert _get_system_prompt("meraki-specialist").startswith(
+                "You are meraki-specialist."
+            )
+    finally:
+        _cached_base_prompt.cache_clear()
+
+
+def test_agent_prompts_independent_of_cwd(tmp_path, monkeypatch):
+    """Test both prompt loaders resolve from the repo, not the working directory."""
+    expected = (
+        Path(__file__).resolve().parent.parent / ".claude" / "agents" / "network-analyst.md"
+    ).read_text(encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    _cached_base_prompt.cache_clear()
+    try:
+        assert load_agent_base_prompt("network-analyst") == expected
+        assert _load_agent_prompt("network-analyst") == expected
+    finally:
+        _cached_base_prompt.cache_clear()
+
+
 def test_function_registry():
     """Test FUNCTION_REGISTRY is populated."""
     assert len(FUNCTION_REGISTRY) > 0
@@ -154,6 +240,29 @@ def test_quick_classify_explicit_prefix_workflow():
     assert not result.requires_confirmation
 
 
+def test_quick_classify_explicit_prefix_shares_result():
+    """Test prefix aliases reuse one precomputed result per agent."""
+    first = _quick_classify("@config vlan 10")
+    second = _quick_classify("@specialist block telnet")
+    assert first is second
+    assert first.reasoning == "Explicit prefix @specialist/@config"
+
+
+def test_quick_classify_explicit_prefix_skips_sanitize():
+    """Test explicit prefixes are matched before sanitizing the message."""
+    with patch("scripts.agent_router._sanitize_input") as mock_sanitize:
+        result = _quick_classify("@Workflow " + "x" * 10_000)
+    assert result.agent_name == "workflow-creator"
+    mock_sanitize.assert_not_called()
+
+
+def test_quick_classify_prefix_after_control_chars():
+    """Test a prefix preceded by control characters still routes."""
+    result = _quick_classify("\x00\x1b@analyst check network")
+    assert result.agent_name == "network-analyst"
+    assert result.confidence == 1.0
+
+
 def test_quick_classify_network_analyst_patterns():
     """Test network-analyst pattern matching."""
     test_cases = [
@@ -172,6 +281,14 @@ def test_quick_classify_network_analyst_patterns():
         assert result.confidence > 0.0
 
 
+def test_quick_classify_weights_each_keyword_count_once():
+    """Test repeated keywords score count * weight, not a running float sum."""
+    # vlan x10 at 1.2 must total exactly 12.0 and beat alert x8 at 1.5
+    result = _quick_classify("vlan " * 10 + "alert " * 8)
+    assert result.agent_name == "meraki-specialist"
+    assert result.reasoning == "Pattern match (score: 12.0)"
+
+
 def test_quick_classify_meraki_specialist_patterns():
     """Test meraki-specialist pattern matching."""
     test_cases = [
@@ -251,6 +368,21 @@ async def test_llm_classify_success():
     assert "LLM" in result.reasoning
 
 
+@pytest.mark.asyncio
+async def test_llm_classify_interns_agent_name():
+    """Test LLM agent names are the interned AGENTS keys."""
+    mock_engine = AsyncMock()
+    mock_engine.classify = AsyncMock(return_value={
+        "agent": "".join(["meraki-", "specialist"]),
+        "confidence": 0.9,
+    })
+
+    from scripts.agent_router import _llm_classify
+    result = await _llm_classify("turn off port 4 on the core switch", mock_engine)
+
+    assert result.agent_name is next(k for k in AGENTS if k == "meraki-specialist")
+
+
 @pytest.mark.asyncio
 async def test_llm_classify_failure_fallback():
     """Test LLM classification failure with fallback to quick classify."""
@@ -266,6 +398,73 @@ async def test_llm_classify_failure_fallback():
     assert "unavailable" in result.reasoning.lower()
 
 
+@pytest.mark.asyncio
+async def test_llm_classify_caches_by_fingerprint():
+    """Test repeated messages reuse the cached LLM classification."""
+    mock_engine = AsyncMock()
+    mock_engine.classify = AsyncMock(return_value={
+        "agent": "workflow-creator",
+        "confidence": 0.85,
+        "reasoning": "LLM identified automation intent",
+    })
+
+    from scripts.agent_router import _llm_classify
+    first = await _llm_classify("Automate the reboot, please!", mock_engine)
+    second = await _llm_classify("automate the  reboot please", mock_engine)
+
+    assert mock_engine.classify.await_count == 1
+    assert second is first
+    assert second.agent_name == "workflow-creator"
+
+
+@pytest.mark.asyncio
+async def test_llm_classify_cache_scoped_to_model():
+    """Test switching provider/model does not reuse the old model's answer."""
+    mock_engine = AsyncMock()
+    mock_engine.provider = "anthropic"
+    mock_engine.model = "claude-haiku"
+    mock_engine.classify = AsyncMock(return_value={
+        "agent": "workflow-creator",
+        "confidence": 0.85,
+    })
+
+    from scripts.agent_router import _llm_classify
+    await _llm_classify("automate the reboot", mock_engine)
+    mock_engine.model = "claude-sonnet"
+    await _llm_classify("automate the reboot", mock_engine)
+    await _llm_classify("automate the reboot", mock_engine)
+
+    assert mock_engine.classify.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_llm_classify_failure_not_cached():
+    """Test fallback results are not cached."""
+    mock_engine = AsyncMock()
+    mock_engine.classify = AsyncMock(side_effect=Exception("API Error"))
+
+    from scripts.agent_router import _llm_classify
+    await _llm_classify("analyze network", mock_engine)
+    await _llm_classify("analyze network", mock_engine)
+
+    assert mock_engine.classify.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_llm_classify_failure_discounts_quick_result():
+    """Test LLM failure falls back to a discounted quick classification."""
+    mock_engine = AsyncMock()
+    mock_engine.classify = AsyncMock(side_effect=Exception("API Error"))
+
+    from scripts.agent_router import _llm_classify
+    quick = _quick_classify("analyze network")
+    result = await _llm_classify("analyze network", mock_engine)
+
+    assert result.agent_name == quick.agent_name
+    assert result.confidence == pytest.approx(quick.confidence * 0.8)
+    assert result.reasoning.endswith(" (LLM unavailable)")
+
+
 # ==================== Test Classification Pipeline ====================
 
 
@@ -304,6 +503,125 @@ async def test_classify_intent_with_llm():
     assert result.agent_name in ["workflow-creator", "meraki-specialist"]
 
 
+@pytest.mark.asyncio
+async def test_classify_intent_caches_exact_repeats():
+    """Test confident results are served from the exact-match cache."""
+    mock_engine = AsyncMock()
+    mock_engine.classify = AsyncMock(return_value={
+        "agent": "workflow-creator",
+        "confidence": 0.85,
+        "reasoning": "LLM determined workflow intent",
+    })
+
+    with patch("scripts.agent_router._quick_classify", wraps=_quick_classify) as spy:
+        first = await classify_intent("hello there", mock_engine)
+        second = await classify_intent("Hello there", mock_engine)
+
+    assert first.agent_name == second.agent_name == "workflow-creator"
+    assert spy.call_count == 1
+    assert mock_engine.classify.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_classify_intent_low_confidence_not_cached():
+    """Test low-confidence guesses are recomputed each time."""
+    with patch("scripts.agent_router._quick_classify", wraps=_quick_classify) as spy:
+        await classify_intent("hello")
+        await classify_intent("hello")
+
+    assert spy.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_classify_intent_truncated_messages_not_cached():
+    """Test messages sharing a sanitized prefix are not conflated."""
+    mock_engine = AsyncMock()
+    mock_engine.classify = AsyncMock(return_value={
+        "agent": "workflow-creator",
+        "confidence": 0.85,
+    })
+    head = "hello " * 100
+
+    await classify_intent(head + "one", mock_engine)
+    await classify_intent(head + "two", mock_engine)
+
+    assert mock_engine.classify.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_classify_intent_cache_keyed_on_raw_message():
+    """Test messages differing only in stripped characters are not conflated."""
+    mock_engine = AsyncMock()
+    mock_engine.classify = AsyncMock(return_value={
+        "agent": "workflow-creator",
+        "confidence": 0.85,
+    })
+
+    with patch("scripts.agent_router._quick_classify", wraps=_quick_classify) as spy:
+        await classify_intent("hello there", mock_engine)
+        await classify_intent("hello\x00 there", mock_engine)
+
+    assert spy.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_classify_intent_cache_follows_task_registry():
+    """Test a newly registered task is not masked by a cached result."""
+    mock_engine = AsyncMock()
+    mock_engine.classify = AsyncMock(return_value={
+        "agent": "workflow-creator",
+        "confidence": 0.85,
+    })
+    registry = TaskRegistry()
+    registry.register_task(TaskDefinition(name="placeholder", agent="network-analyst"))
+
+    with patch("scripts.agent_router._task_registry", registry):
+        first = await classify_intent("hello there", mock_engine)
+        registry.register_task(TaskDefinition(
+            name="greet", agent="network-analyst", trigger_keywords=["hello", "there"],
+        ))
+        second = await classify_intent("hello there", mock_engine)
+
+    assert first.task_definition is None
+    assert second.task_definition is not None
+    assert second.task_definition.name == "greet"
+
+
+@pytest.mark.asyncio
+async def test_classify_intent_cache_scoped_to_model():
+    """Test switching provider/model does not reuse the old model's routing."""
+    mock_engine = AsyncMock()
+    mock_engine.provider = "anthropic"
+    mock_engine.model = "claude-haiku"
+    mock_engine.classify = AsyncMock(return_value={
+        "agent": "workflow-creator",
+        "confidence": 0.85,
+    })
+
+    await classify_intent("hello there", mock_engine)
+    mock_engine.model = "claude-sonnet"
+    mock_engine.classify.return_value = {"agent": "report-designer", "confidence": 0.85}
+    result = await classify_intent("hello there", mock_engine)
+
+    assert result.agent_name == "report-designer"
+    assert mock_engine.classify.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_classify_intent_bounds_oversized_input():
+    """Test every tier sees at most MAX_CLASSIFY_CHARS of the message."""
+    mock_engine = AsyncMock()
+    mock_engine.classify = AsyncMock(return_value={
+        "agent": "network-analyst",
+        "confidence": 0.85,
+    })
+
+    await classify_intent("hello " * 1_000_000, mock_engine)
+
+    sent = mock_engine.classify.await_args.args[0]
+    assert len(sent) == MAX_CLASSIFY_CHARS
+
+
 @pytest.mark.asyncio
 async def test_classify_intent_low_confidence():
     """Test classification with low confidence requires confirmation."""
@@ -391,6 +709,401 @@ async def test_process_message_basic():
     assert "agent" in chunks[0]
 
 
+def _stream_chunk(content=None, tool_calls=None):
+    """Build an OpenAI-style streaming chunk with a single delta."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=content, tool_calls=tool_calls))]
+    )
+
+
+def _engine_streaming(*chunks):
+    """Build a mock AI engine whose chat_completion streams the given chunks."""
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    mock_engine = AsyncMock()
+    mock_engine.chat_completion = AsyncMock(side_effect=lambda **kwargs: stream())
+    return mock_engine
+
+
+# Settings that keep process_message on the legacy LLM flow
+_LEGACY_FLOW = SimpleNamespace(use_modular_tasks=False)
+
+
+@pytest.mark.asyncio
+async def test_process_message_streams_content():
+    """Test legacy flow streams delta content and skips malformed chunks."""
+    mock_engine = _engine_streaming(
+        SimpleNamespace(),  # no choices
+        SimpleNamespace(choices=[]),
+        SimpleNamespace(choices=[SimpleNamespace()]),  # no delta
+        _stream_chunk("Hello "),
+        _stream_chunk(None),
+        _stream_chunk("world"),
+    )
+
+    chunks = [
+        chunk async for chunk in process_message(
+            "analyze network", ai_engine=mock_engine, settings=_LEGACY_FLOW
+        )
+    ]
+
+    assert "".join(c["chunk"] for c in chunks if c["type"] == "stream") == "Hello world"
+    assert not [c for c in chunks if c["type"] == "error"]
+
+
+@pytest.mark.asyncio
+async def test_process_message_warns_on_empty_response(caplog):
+    """Test a response with no content and no tool calls is logged."""
+    mock_engine = _engine_streaming(_stream_chunk(None), _stream_chunk(""))
+
+    with caplog.at_level("WARNING", logger="scripts.agent_router"):
+        chunks = [
+            chunk async for chunk in process_message(
+                "analyze network", ai_engine=mock_engine, settings=_LEGACY_FLOW
+            )
+        ]
+
+    assert [c["type"] for c in chunks] == ["classification"]
+    assert "Empty LLM response for agent network-analyst" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_process_message_coalesces_stream_tokens():
+    """Test fast token streams are batched and flushed before tool results."""
+    text = "x" * 200
+    mock_engine = _engine_streaming(
+        *(_stream_chunk(char) for char in text),
+        _stream_chunk(tool_calls=[_tool_delta(0, "list_workflows", "{}")]),
+    )
+    execute = AsyncMock(return_value=(True, {}, None))
+
+    with patch("scripts.agent_router._execute_function", execute):
+        chunks = [
+            chunk async for chunk in process_message(
+                "analyze network", ai_engine=mock_engine, settings=_LEGACY_FLOW
+            )
+        ]
+
+    streamed = [c["chunk"] for c in chunks if c["type"] == "stream"]
+    assert "".join(streamed) == text
+    assert len(streamed) < len(text)
+    assert chunks[-1]["type"] == "function_result"
+
+
+async def _first_stream_event(gen):
+    """Advance a process_message generator to its first stream event."""
+    async for chunk in gen:
+        if chunk["type"] == "stream":
+            return chunk
+
+
+@pytest.mark.asyncio
+async def test_process_message_flushes_text_before_tool_deltas():
+    """Test buffered text is sent once tool-call arguments start streaming."""
+    released = asyncio.Event()
+
+    async def stream():
+        yield _stream_chunk("Let me check")
+        yield _stream_chunk(tool_calls=[_tool_delta(0, "list_workflows", '{"cli')])
+        await released.wait()
+        yield _stream_chunk(tool_calls=[_tool_delta(0, None, 'ent": "x"}')])
+
+    mock_engine = AsyncMock()
+    mock_engine.chat_completion = AsyncMock(side_effect=lambda **kwargs: stream())
+    execute = AsyncMock(return_value=(True, {}, None))
+
+    with (
+        patch("scripts.agent_router.STREAM_FLUSH_SECONDS", 60),
+        patch("scripts.agent_router._execute_function", execute),
+    ):
+        gen = process_message("analyze network", ai_engine=mock_engine, settings=_LEGACY_FLOW)
+        first = await asyncio.wait_for(_first_stream_event(gen), timeout=1)
+        released.set()
+        rest = [chunk async for chunk in gen]
+
+    assert first["chunk"] == "Let me check"
+    assert execute.await_args.args == ("list_workflows", {"client": "x"})
+    assert rest[-1]["type"] == "function_result"
+
+
+@pytest.mark.asyncio
+async def test_process_message_flushes_text_when_stream_stalls():
+    """Test buffered text is sent after STREAM_FLUSH_SECONDS with no new chunk."""
+    released = asyncio.Event()
+
+    async def stream():
+        yield _stream_chunk("Hello")
+        await released.wait()
+        yield _stream_chunk(" world")
+
+    mock_engine = AsyncMock()
+    mock_engine.chat_completion = AsyncMock(side_effect=lambda **kwargs: stream())
+
+    gen = process_message("analyze network", ai_engine=mock_engine, settings=_LEGACY_FLOW)
+    first = await asyncio.wait_for(_first_stream_event(gen), timeout=1)
+    released.set()
+    rest = [chunk async for chunk in gen]
+
+    assert first["chunk"] == "Hello"
+    assert "".join(c["chunk"] for c in rest if c["type"] == "stream") == " world"
+
+
+def _tool_delta(index, name=None, arguments=None):
+    """Build a streamed tool-call fragment."""
+    return SimpleNamespace(
+        index=index, function=SimpleNamespace(name=name, arguments=arguments)
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_message_joins_streamed_tool_arguments():
+    """Test tool calls run once, with arguments joined across deltas."""
+    mock_engine = _engine_streaming(
+        _stream_chunk(tool_calls=[_tool_delta(0, "discover_networks", '{"org')]),
+        _stream_chunk(tool_calls=[_tool_delta(1, "list_workflows", "")]),
+        _stream_chunk(tool_calls=[_tool_delta(0, None, '_id": "123"}')]),
+    )
+    execute = AsyncMock(return_value=(True, {"ok": True}, None))
+
+    with patch("scripts.agent_router._execute_function", execute):
+        chunks = [
+            chunk async for chunk in process_message(
+                "analyze network", ai_engine=mock_engine, settings=_LEGACY_FLOW
+            )
+        ]
+
+    assert execute.await_args_list == [
+        (("discover_networks", {"org_id": "123"}),),
+        (("list_workflows", {}),),
+    ]
+    results = [c["function"] for c in chunks if c["type"] == "function_result"]
+    assert results == ["discover_networks", "list_workflows"]
+
+
+@pytest.mark.asyncio
+async def test_process_message_interns_tool_names():
+    """Test streamed tool names are the interned registry keys."""
+    mock_engine = _engine_streaming(
+        _stream_chunk(tool_calls=[_tool_delta(0, "".join(["find_", "issues"]), "{}")]),
+    )
+    execute = AsyncMock(return_value=(True, {}, None))
+
+    with patch("scripts.agent_router._execute_function", execute):
+        async for _ in process_message(
+            "analyze network", ai_engine=mock_engine, settings=_LEGACY_FLOW
+        ):
+            pass
+
+    func_name = execute.await_args.args[0]
+    assert func_name is next(name for name in FUNCTION_REGISTRY if name == "find_issues")
+
+
+@pytest.mark.asyncio
+async def test_process_message_tool_call_indices_with_gaps():
+    """Test tool calls run in index order even when indices skip."""
+    mock_engine = _engine_streaming(
+        _stream_chunk(tool_calls=[_tool_delta(2, "backup_config", "{}")]),
+        _stream_chunk(tool_calls=[_tool_delta(None, "list_workflows", "{}")]),
+    )
+    execute = AsyncMock(return_value=(True, {}, None))
+
+    with patch("scripts.agent_router._execute_function", execute):
+        async for _ in process_message(
+            "analyze network", ai_engine=mock_engine, settings=_LEGACY_FLOW
+        ):
+            pass
+
+    assert [c.args[0] for c in execute.await_args_list] == ["backup_config", "list_workflows"]
+
+
+@pytest.mark.asyncio
+async def test_process_message_tool_call_sparse_indices():
+    """Test a huge provider index is keyed, not used to size a list."""
+    mock_engine = _engine_streaming(
+        _stream_chunk(tool_calls=[_tool_delta(10**9, "list_workflows", "{}")]),
+        _stream_chunk(tool_calls=[_tool_delta(5, "backup_config", "{}")]),
+    )
+    execute = AsyncMock(return_value=(True, {}, None))
+
+    with patch("scripts.agent_router._execute_function", execute):
+        async for _ in process_message(
+            "analyze network", ai_engine=mock_engine, settings=_LEGACY_FLOW
+        ):
+            pass
+
+    assert [c.args[0] for c in execute.await_args_list] == ["backup_config", "list_workflows"]
+
+
+@pytest.mark.asyncio
+async def test_process_message_runs_read_only_tools_concurrently():
+    """Test parallel-safe tool calls overlap while results keep call order."""
+    mock_engine = _engine_streaming(
+        _stream_chunk(tool_calls=[
+            _tool_delta(0, "discover_networks", "{}"),
+            _tool_delta(1, "find_issues", "{}"),
+        ]),
+    )
+    running = []
+    overlapped = asyncio.Event()
+
+    async def execute(func_name, args):
+        running.append(func_name)
+        if len(running) == 2:
+            overlapped.set()
+        await asyncio.wait_for(overlapped.wait(), timeout=1)
+        return True, {"result": func_name}, None
+
+    with patch("scripts.agent_router._execute_function", side_effect=execute):
+        chunks = [
+            chunk async for chunk in process_message(
+                "analyze network", ai_engine=mock_engine, settings=_LEGACY_FLOW
+            )
+        ]
+
+    results = [c["function"] for c in chunks if c["type"] == "function_result"]
+    assert results == ["discover_networks", "find_issues"]
+
+
+@pytest.mark.asyncio
+async def test_process_message_bounds_concurrent_tools():
+    """Test concurrent parallel-safe tool calls are capped per turn."""
+    calls = MAX_CONCURRENT_TOOL_CALLS + 4
+    mock_engine = _engine_streaming(
+        _stream_chunk(tool_calls=[_tool_delta(i, "find_issues", "{}") for i in range(calls)]),
+    )
+    in_flight = 0
+    peak = 0
+
+    async def execute(func_name, args):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return True, {}, None
+
+    with patch("scripts.agent_router._execute_function", side_effect=execute):
+        chunks = [
+            chunk async for chunk in process_message(
+                "analyze network", ai_engine=mock_engine, settings=_LEGACY_FLOW
+            )
+        ]
+
+    assert peak == MAX_CONCURRENT_TOOL_CALLS
+    assert len([c for c in chunks if c["type"] == "function_result"]) == calls
+
+
+@pytest.mark.asyncio
+async def test_process_message_runs_config_tools_in_order():
+    """Test a batch with a config change executes sequentially."""
+    mock_engine = _engine_streaming(
+        _stream_chunk(tool_calls=[
+            _tool_delta(0, "backup_config", "{}"),
+            _tool_delta(1, "delete_vlan", '{"vlan_id": 10}'),
+        ]),
+    )
+    order = []
+
+    async def execute(func_name, args):
+        order.append(("start", func_name))
+        await asyncio.sleep(0)
+        order.append(("end", func_name))
+        return True, {}, None
+
+    with patch("scripts.agent_router._execute_function", side_effect=execute):
+        async for _ in process_message(
+            "analyze network", ai_engine=mock_engine, settings=_LEGACY_FLOW
+        ):
+            pass
+
+    assert order == [
+        ("start", "backup_config"),
+        ("end", "backup_config"),
+        ("start", "delete_vlan"),
+        ("end", "delete_vlan"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_process_message_runs_dependent_safe_tools_in_order():
+    """Test SAFE tools with local side effects keep the model's order."""
+    mock_engine = _engine_streaming(
+        _stream_chunk(tool_calls=[
+            _tool_delta(0, "discover_vlans", "{}"),
+            _tool_delta(1, "save_snapshot", "{}"),
+            _tool_delta(2, "compare_snapshots", "{}"),
+        ]),
+    )
+    order = []
+
+    async def execute(func_name, args):
+        order.append(("start", func_name))
+        await asyncio.sleep(0)
+        order.append(("end", func_name))
+        return True, {}, None
+
+    with patch("scripts.agent_router._execute_function", side_effect=execute):
+        async for _ in process_message(
+            "analyze network", ai_engine=mock_engine, settings=_LEGACY_FLOW
+        ):
+            pass
+
+    assert order == [
+        ("start", "discover_vlans"),
+        ("end", "discover_vlans"),
+        ("start", "save_snapshot"),
+        ("end", "save_snapshot"),
+        ("start", "compare_snapshots"),
+        ("end", "compare_snapshots"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_process_message_sends_agent_system_prompt():
+    """Test the legacy flow opens with the agent's resolved system prompt."""
+    mock_engine = _engine_streaming(_stream_chunk("ok"))
+
+    async for _ in process_message(
+        "analyze network",
+        ai_engine=mock_engine,
+        session_context=[{"role": "user", "content": "hi"}],
+        settings=_LEGACY_FLOW,
+    ):
+        pass
+
+    agent = AGENTS["network-analyst"]
+    messages = mock_engine.chat_completion.call_args.kwargs["messages"]
+    assert messages[0] == {
+        "role": "system",
+        "content": _load_agent_prompt(agent.name) or f"You are {agent.name}. {agent.description}",
+    }
+    assert messages[1:] == [
+        {"role": "user", "content": "hi"},
+        {"role": "user", "content": "analyze network"},
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("make_context", [list, lambda history: deque(history, maxlen=20)])
+async def test_process_message_keeps_last_20_context_messages(make_context):
+    """Test session context is trimmed to the last 20 messages."""
+    history = [{"role": "user", "content": f"m{i}"} for i in range(25)]
+    mock_engine = _engine_streaming(_stream_chunk("ok"))
+
+    async for _ in process_message(
+        "analyze network",
+        ai_engine=mock_engine,
+        session_context=make_context(history),
+        settings=_LEGACY_FLOW,
+    ):
+        pass
+
+    messages = mock_engine.chat_completion.call_args.kwargs["messages"]
+    assert messages[1:-1] == history[-20:]
+
+
 @pytest.mark.asyncio
 async def test_process_message_no_engine():
     """Test message processing without AI engine."""
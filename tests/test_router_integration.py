@@ -20,6 +20,7 @@ import pytest
 from scripts.agent_router import (
     ClassificationResult,
     classify_intent,
+    clear_classification_cache,
     process_message,
     _get_task_registry,
     _task_registry,
@@ -33,6 +34,14 @@ from scripts.task_models import (
 from scripts.settings import Settings
 
 
+@pytest.fixture(autouse=True)
+def _clear_classification_cache():
+    """Isolate tests from results cached by earlier classifications."""
+    clear_classification_cache()
+    yield
+    clear_classification_cache()
+
+
 # ==================== ClassificationResult Extension ====================
 
 
@@ -8,7 +8,10 @@ Covers:
 """
 
 import asyncio
+import inspect
 import json
+import os
+import threading
 import uuid
 from datetime import datetime
 from pathlib import Path
@@ -222,6 +225,18 @@ class TestSerializeResult:
         result = serialize_result(data)
         assert result["items"][0]["path"] == "/a"
 
+    def test_json_safe_containers_are_shared(self):
+        data = {"items": [{"id": 1}, {"id": 2}], "count": 2}
+        assert serialize_result(data) is data
+
+    def test_only_changed_containers_are_copied(self):
+        unchanged = [{"id": 1}]
+        data = {"ok": unchanged, 1: (Path("/a"),)}
+        result = serialize_result(data)
+        assert result == {"ok": [{"id": 1}], "1": ["/a"]}
+        assert result is not data
+        assert result["ok"] is unchanged
+
     def test_unknown_type(self):
         class Custom:
             def __str__(self):
@@ -248,6 +263,15 @@ class TestExecuteFunction:
         assert result["result"]["sum"] == 3
         assert error is None
 
+    @pytest.mark.asyncio
+    async def test_runs_on_io_pool(self):
+        def thread_name():
+            return threading.current_thread().name
+
+        success, result, _ = await execute_function("name", {}, {"name": thread_name})
+        assert success is True
+        assert result["result"].startswith("meraki-io")
+
     @pytest.mark.asyncio
     async def test_function_raises_exception(self):
         def failing_func():
@@ -258,10 +282,59 @@ class TestExecuteFunction:
         assert success is False
         assert "test error" in error
 
+    def test_settings_reloaded_only_when_file_changes(self, tmp_path):
+        from scripts import executor_utils
+        from scripts.settings import SettingsManager
+
+        settings_file = tmp_path / "settings.json"
+        settings_file.write_text(json.dumps({"meraki_profile": "first"}))
+
+        with (
+            patch.object(SettingsManager, "SETTINGS_FILE", settings_file),
+            patch.object(executor_utils, "_settings_cache", None),
+        ):
+            first = executor_utils._load_settings()
+            assert executor_utils._load_settings() is first
+            assert first.meraki_profile == "first"
+
+            settings_file.write_text(json.dumps({"meraki_profile": "second"}))
+            os.utime(settings_file, ns=(0, settings_file.stat().st_mtime_ns + 1))
+            assert executor_utils._load_settings().meraki_profile == "second"
+
+    @pytest.mark.asyncio
+    async def test_signature_inspected_once_per_function(self):
+        def mock_func(x):
+            return x
+
+        registry = {"echo": mock_func}
+        with patch("scripts.executor_utils.inspect.signature", wraps=inspect.signature) as sig:
+            await execute_function("echo", {"x": 1}, registry)
+            await execute_function("echo", {"x": 2}, registry)
+        assert sig.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unhashable_callable(self):
+        class Handler:
+            __hash__ = None
+
+            def __call__(self, x):
+                return x
+
+        success, result, error = await execute_function("echo", {"x": 1}, {"echo": Handler()})
+        assert success is True
+        assert result == {"result": 1}
+        assert error is None
+
 
 # ==================== task_executor.py Tests ====================
 
 
+@pytest.fixture(autouse=True)
+def isolated_cwd(tmp_path, monkeypatch):
+    """Run from tmp_path so task-run state and backups stay out of the repo."""
+    monkeypatch.chdir(tmp_path)
+
+
 def _make_settings(**overrides):
     """Create a mock Settings object."""
     settings = MagicMock()
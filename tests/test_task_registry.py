@@ -377,6 +377,18 @@ Configure switching infrastructure.
         count = registry.reload()
         assert count == 2
 
+    def test_version_bumps_on_change(self, tmp_path):
+        registry = TaskRegistry()
+        versions = [registry.version]
+        registry.load_tasks(self._make_task_files(tmp_path))
+        versions.append(registry.version)
+        registry.register_task(TaskDefinition(name="extra", agent="network-analyst"))
+        versions.append(registry.version)
+        registry.reload()
+        versions.append(registry.version)
+
+        assert versions == sorted(set(versions))
+
     def test_get_task(self, tmp_path):
         root = self._make_task_files(tmp_path)
         registry = TaskRegistry()
@@ -418,3 +430,16 @@ Configure switch ports.
         task = registry.find_matching_task("configure switch port on device")
         assert task is not None
         assert task.name == "switch-port-task"
+
+    def test_reregistered_task_uses_new_keywords(self):
+        registry = TaskRegistry()
+        registry.register_task(TaskDefinition(
+            name="t", agent="network-analyst", trigger_keywords=["Health", "Status"],
+        ))
+        assert registry.find_matching_task("health status please") is not None
+
+        registry.register_task(TaskDefinition(
+            name="t", agent="network-analyst", trigger_keywords=["uplink", "latency"],
+        ))
+        assert registry.find_matching_task("health status please") is None
+        assert registry.find_matching_task("uplink latency please") is not None